@@ -3,59 +3,65 @@ Debug syntax errors in strategy.py
 
 This script analyzes the Python syntax in strategy.py and finds syntax errors
 """
-import tokenize
-import io
 import re
 import os
 
+def triple_quote_positions(line):
+    """Return the column of every triple quote in the line"""
+    positions = []
+    pos = line.find('"""')
+    while pos >= 0:
+        positions.append(pos)
+        pos = line.find('"""', pos + 3)
+    return positions
+
 def debug_file():
     strategy_file = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
     
-    # Read the file
-    with open(strategy_file, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
-    
-    # Split into lines for analysis
-    lines = content.split('\n')
+    # Check for specific syntax around line 103
+    target_line = 102  # 0-indexed
+    context_lines = 10
+    window_start = max(0, target_line - context_lines)
+    window_end = target_line + context_lines
     
     # Search for problematic docstrings (unterminated or incorrectly terminated)
     print("Checking for problematic docstrings...")
     
-    # Look for triple quotes that might be problematic
-    line_num = 0
-    in_docstring = False
-    docstring_start = -1
-    triple_quotes = []
+    # Stream the file once: count triple quotes, report lines with an odd count
+    # and keep only the lines around the target in memory
+    total_triples = 0
+    context = []
+    with open(strategy_file, 'r', encoding='utf-8', errors='replace') as f:
+        for i, line in enumerate(f):
+            line = line.rstrip('\n')
+            positions = triple_quote_positions(line)
+            count = len(positions)
+            total_triples += count
+            if count % 2 != 0:
+                print(f"Line {i+1} has odd number of triple quotes: {count} (columns {positions})")
+                print(f"  Content: {line}")
+            if window_start <= i <= window_end:
+                context.append((i, line))
     
-    for i, line in enumerate(lines):
-        # Count triple quotes in this line
-        matches = re.finditer(r'"""', line)
-        positions = [match.start() for match in matches]
-        
-        for pos in positions:
-            triple_quotes.append((i, pos))
-            
     # If we have an odd number of triple quotes, that's a problem
-    if len(triple_quotes) % 2 != 0:
-        print(f"CRITICAL: Odd number of triple quotes detected: {len(triple_quotes)}")
-        
-    # Check for lines with odd number of triple quotes
-    for i, line in enumerate(lines):
-        count = line.count('"""')
-        if count % 2 != 0:
-            print(f"Line {i+1} has odd number of triple quotes: {count}")
-            print(f"  Content: {line}")
-    
-    # Check for specific syntax around line 103
-    target_line = 102  # 0-indexed
-    context_lines = 10
+    if total_triples % 2 != 0:
+        print(f"CRITICAL: Odd number of triple quotes detected: {total_triples}")
     
     print(f"\nAnalyzing context around line {target_line+1}:")
-    for i in range(max(0, target_line - context_lines), min(len(lines), target_line + context_lines + 1)):
+    for i, line in context:
         if i == target_line:
-            print(f">>> {i+1}: {lines[i]}")
+            print(f">>> {i+1}: {line}")
         else:
-            print(f"    {i+1}: {lines[i]}")
+            print(f"    {i+1}: {line}")
+    
+    # Read the raw bytes for the reset_state repair. The line offset table lets
+    # the fix be spliced in place instead of rejoining every line of the file.
+    with open(strategy_file, 'rb') as f:
+        content = f.read()
+    lines = content.split(b'\n')
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line) + 1)
     
     # Write a clean version of the problem section
     print("\nAttempting to fix the reset_state method...")
@@ -65,14 +71,14 @@ def debug_file():
     reset_state_end = -1
     
     for i, line in enumerate(lines):
-        if "def reset_state" in line:
+        if b"def reset_state" in line:
             reset_state_start = i
             break
     
     # Find the end of reset_state method
     if reset_state_start >= 0:
         for i in range(reset_state_start + 1, len(lines)):
-            if re.match(r'\s*def\s+', lines[i]):
+            if re.match(rb'\s*def\s+', lines[i]):
                 reset_state_end = i - 1
                 break
                 
@@ -81,30 +87,36 @@ def debug_file():
             
         print(f"reset_state method spans lines {reset_state_start+1} to {reset_state_end+1}")
         
-        # Create a fixed version
+        # Create a fixed version, keeping the file's line endings
+        eol = b'\r' if lines[reset_state_start].endswith(b'\r') else b''
         fixed_reset_state = [
-            "    def reset_state(self):",
-            '        """Reset all state variables for a clean start"""',
-            "        # OI analysis results",
+            b"    def reset_state(self):" + eol,
+            b'        """Reset all state variables for a clean start"""' + eol,
+            b"        # OI analysis results" + eol,
         ]
         
         # Add the rest of the method body
         in_body = False
         for i in range(reset_state_start + 1, reset_state_end + 1):
             line = lines[i]
-            if line.strip().startswith("self.") or in_body:
+            if line.strip().startswith(b"self.") or in_body:
                 in_body = True
                 fixed_reset_state.append(line)
         
         print("\nFixed reset_state method:")
         for line in fixed_reset_state:
-            print(line)
+            print(line.decode('utf-8', errors='replace').rstrip('\r'))
             
-        # Write fixed reset_state back to the file
-        lines[reset_state_start:reset_state_end+1] = fixed_reset_state
+        # Splice the fixed reset_state over its byte range; the newline that ends
+        # the last replaced line is left in place
+        byte_start = offsets[reset_state_start]
+        byte_end = min(offsets[reset_state_end + 1] - 1, len(content))
+        buf = bytearray(content)
+        buf[byte_start:byte_end] = b'\n'.join(fixed_reset_state)
         
-        with open(strategy_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        with open(strategy_file, 'wb') as f:
+            f.write(buf)
+        lines = bytes(buf).split(b'\n')
             
         print("\nFile updated with fixed reset_state method")
         
@@ -113,7 +125,7 @@ def debug_file():
     
     has_trailing_stoploss = False
     for i, line in enumerate(lines):
-        if "def update_trailing_stoploss" in line:
+        if b"def update_trailing_stoploss" in line:
             has_trailing_stoploss = True
             print(f"Found update_trailing_stoploss at line {i+1}")
             
@@ -6,9 +6,16 @@ import os
 import sys
 import logging
 import datetime
+import traceback
+import pytz
+
+from src import ensure_dir
+
+# Timezone used for all IST timestamps
+IST = pytz.timezone('Asia/Kolkata')
 
 # Configure logging
-os.makedirs("logs", exist_ok=True)
+ensure_dir("logs")
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -37,10 +44,8 @@ try:
     print("Initializing strategy...")
     init_result = strategy.initialize_day()
     print(f"Initialization result: {init_result}")
-      # Get current time in IST using pytz directly
-    import pytz
-    import datetime
-    ist_time = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+    # Get current time in IST
+    ist_time = datetime.datetime.now(IST)
     print(f"Current IST time: {ist_time}")
     
     # Run the strategy with force analysis to take a trade immediately
@@ -51,7 +56,6 @@ try:
     print("\nStrategy run completed!")
     
 except Exception as e:
-    import traceback
     print(f"Error running strategy: {e}")
     print(traceback.format_exc())
 
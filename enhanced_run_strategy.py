@@ -6,11 +6,17 @@ import os
 import sys
 import logging
 import datetime
-import time
+import traceback
+import threading
 import pytz
 
+from src import ensure_dir
+
+# Timezone used for all IST timestamps
+IST = pytz.timezone('Asia/Kolkata')
+
 # Configure logging
-os.makedirs("logs", exist_ok=True)
+ensure_dir("logs")
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -27,12 +33,22 @@ print("=" * 80)
 print("ENHANCED STRATEGY EXECUTION")
 print("=" * 80)
 
+# Set as soon as the strategy assigns an active trade
+trade_event = threading.Event()
+
 try:
     # Import the fixed strategy class
     from src.fixed_strategy_updated import FixedOpenInterestStrategy
     
+    class TradeNotifyingStrategy(FixedOpenInterestStrategy):
+        """Signals trade_event whenever a trade is assigned to active_trade"""
+        def __setattr__(self, name, value):
+            super().__setattr__(name, value)
+            if name == 'active_trade' and value:
+                trade_event.set()
+    
     # Create strategy instance
-    strategy = FixedOpenInterestStrategy()
+    strategy = TradeNotifyingStrategy()
     print(f"Strategy instance created: {type(strategy).__name__}")
     
     # Initialize the strategy
@@ -46,7 +62,7 @@ try:
     print("Strategy initialized successfully.")
     
     # Get current time in IST
-    ist_time = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
+    ist_time = datetime.datetime.now(IST)
     print(f"Current IST time: {ist_time}")
     
     # Run the strategy with force_analysis=True to attempt to take a trade
@@ -69,13 +85,8 @@ try:
     
     # Monitor for some time to see if a trade is taken
     print("Monitoring for trades for 30 seconds...")
-    start_time = time.time()
-    while time.time() - start_time < 30:
-        if hasattr(strategy, 'active_trade') and strategy.active_trade:
-            print(f"Trade detected: {strategy.active_trade}")
-            break
-        time.sleep(2)
-        print(".", end="", flush=True)
+    if trade_event.wait(timeout=30):
+        print(f"Trade detected: {strategy.active_trade}")
     
     print("\nStrategy execution completed.")
     
@@ -90,7 +101,6 @@ try:
     print("\nStrategy run completed!")
     
 except Exception as e:
-    import traceback
     print(f"Error running strategy: {e}")
     print(traceback.format_exc())
 
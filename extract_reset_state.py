@@ -1,7 +1,14 @@
 """
 Extract reset_state from strategy_fixed.py and replace it in strategy.py
 """
-import re
+
+def find_method(text, name, indent='    '):
+    """Return the (start, end) span of a method, ending before the next def at the same indent"""
+    idx = text.find(f'{indent}def {name}(')
+    if idx < 0:
+        return None
+    end = text.find(f'\n{indent}def ', idx + 1)
+    return (idx, end if end >= 0 else len(text))
 
 def extract_and_replace_reset_state():
     fixed_file = 'c:\\vs code projects\\finalized strategies\\src\\strategy_fixed.py'
@@ -12,14 +19,13 @@ def extract_and_replace_reset_state():
         fixed_content = f.read()
     
     # Extract the reset_state method from fixed file
-    reset_pattern = r'def reset_state\(self\):(.*?)(?=\n    def|\Z)'
-    fixed_match = re.search(reset_pattern, fixed_content, re.DOTALL)
+    fixed_span = find_method(fixed_content, 'reset_state')
     
-    if not fixed_match:
+    if not fixed_span:
         print("Could not find reset_state method in fixed file")
         return False
     
-    fixed_reset = 'def reset_state(self):' + fixed_match.group(1)
+    fixed_reset = fixed_content[fixed_span[0]:fixed_span[1]]
     print("Extracted reset_state method from fixed file")
     
     # Read the target file
@@ -27,19 +33,19 @@ def extract_and_replace_reset_state():
         target_content = f.read()
     
     # Find the reset_state method in target file
-    target_match = re.search(reset_pattern, target_content, re.DOTALL)
+    target_span = find_method(target_content, 'reset_state')
     
-    if not target_match:
+    if not target_span:
         print("Could not find reset_state method in target file")
         return False
     
-    # Replace it
-    target_reset = 'def reset_state(self):' + target_match.group(1)
-    new_content = target_content.replace(target_reset, fixed_reset)
-    
-    # Write back
+    # Write back the text around the located span with the fixed method in
+    # between, without building the concatenated file in memory first
+    s, e = target_span
     with open(target_file, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+        f.write(target_content[:s])
+        f.write(fixed_reset)
+        f.write(target_content[e:])
     
     print("Successfully replaced reset_state method")
     return True
@@ -1,29 +1,35 @@
+import os
 import re
 
+# Compiled once; a single alternation covers all three sensitive fields
+_FILTER_RE = re.compile(rb'(client_id=|access_token_head=|token_combo=)[^,\s]+')
+_NEEDLE = b"[DEBUG] get_fyers_client:"
+
 def filter_log_file():
     # Log file path
     log_file_path = 'logs/strategy.log'
     
-    # Read the original content
-    with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-    
-    # Filter each line
-    filtered_lines = []
-    for line in lines:
-        # Replace sensitive information with placeholders
-        if "[DEBUG] get_fyers_client:" in line:
-            # Filter client_id
-            line = re.sub(r'client_id=[^,\s]+', 'client_id=***FILTERED***', line)
-            # Filter access_token
-            line = re.sub(r'access_token_head=[^,\s\n]+', 'access_token_head=***FILTERED***', line)
-            # Filter token combo
-            line = re.sub(r'token_combo=[^,\s\n]+', 'token_combo=***FILTERED***', line)
-        filtered_lines.append(line)
-    
-    # Write back to the file
-    with open(log_file_path, 'w', encoding='utf-8') as f:
-        f.writelines(filtered_lines)
+    # Stream the log as raw bytes into a sibling temp file, one line at a time,
+    # then swap it in atomically
+    tmp_path = log_file_path + '.tmp'
+    try:
+        out_f = open(tmp_path, 'wb')
+        try:
+            with out_f, open(log_file_path, 'rb') as in_f:
+                for line in in_f:
+                    # Replace sensitive information with placeholders
+                    if _NEEDLE in line:
+                        line = _FILTER_RE.sub(rb'\1***FILTERED***', line)
+                    out_f.write(line)
+            os.replace(tmp_path, log_file_path)
+        except BaseException:
+            # Never leave a partial temp file behind
+            os.unlink(tmp_path)
+            raise
+    except PermissionError as e:
+        # On Windows the swap fails (WinError 32) while the strategy holds the log open
+        print(f"Could not filter {log_file_path}, it is in use by another process: {e}")
+        return
     
     print(f"Filtered sensitive information from {log_file_path}")
 
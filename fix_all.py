@@ -0,0 +1,71 @@
+"""
+Run all strategy.py syntax fixers in one pass
+
+Reads strategy.py once, applies the fixes from fix_docstring_mixed_issues.py,
+fix_line_103_specific.py and fix_syntax_line_103_v2.py in memory, and writes
+the result back once (with a single backup) instead of each script reading,
+backing up and rewriting the file on its own.
+"""
+import os
+import shutil
+from datetime import datetime
+
+import fix_docstring_mixed_issues
+import fix_line_103_specific
+import fix_syntax_line_103_v2
+
+def apply_fixes(content):
+    """Apply every fixer to strategy.py content (bytes) in order"""
+    content = fix_docstring_mixed_issues.fix_content(content)
+    content = fix_line_103_specific.fix_content(content)
+    content = fix_syntax_line_103_v2.fix_content(content)
+    return content
+
+def fix_all():
+    strategy_file = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
+
+    try:
+        with open(strategy_file, 'rb') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return False
+
+    if fix_docstring_mixed_issues.is_clean(content):
+        print(f"{strategy_file} is already clean, nothing to fix")
+        return True
+
+    fixed_content = apply_fixes(content)
+    if fixed_content == content:
+        print(f"No changes needed in {strategy_file}")
+        return True
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_file = f"{strategy_file}.backup_{timestamp}"
+    print(f"Creating backup of {strategy_file} to {backup_file}")
+    try:
+        # A hardlink shares the original's data without copying it; the fixed
+        # content goes to a new file below, so the backup keeps the original bytes
+        os.link(strategy_file, backup_file)
+    except OSError:
+        shutil.copy2(strategy_file, backup_file)
+
+    # Write to a temp file and swap it in so an interrupted run never leaves
+    # a half-written strategy.py
+    tmp_file = strategy_file + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(fixed_content)
+        os.replace(tmp_file, strategy_file)
+        print(f"Successfully applied all fixes to {strategy_file}")
+        return True
+    except Exception as e:
+        print(f"Error writing to file: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = fix_all()
+    if success:
+        print("✓ Successfully fixed strategy.py")
+    else:
+        print("✗ Failed to fix strategy.py")
@@ -2,99 +2,46 @@
 Advanced fix for syntax issues in strategy.py
 Resolves unterminated triple-quoted strings, indentation problems, and other syntax errors
 """
+import io
 import os
-import re
+import sys
 import shutil
 import logging
+import tokenize
 
-def fix_docstring_issue():
-    file_path = r'c:\vs code projects\finalized strategies\src\strategy.py'
-    backup_path = file_path + '.complete_syntax_fix_' + str(int(os.path.getmtime(file_path)))
-    
-    print(f"Creating backup at {backup_path}")
-    shutil.copy2(file_path, backup_path)
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as src:
-            content = src.read()
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return
-    
-    # First fix: Replace multiline docstrings with single line versions
-    # This is the safest approach to deal with unterminated docstrings
-    method_patterns = [
-        (r'def update_trailing_stoploss\([^)]*\):\s*"""[^"]*', 
-         'def update_trailing_stoploss(self, current_price):\n        """Update the trailing stoploss based on current price and profit percentage"""\n'),
-        (r'def process_exit\([^)]*\):\s*"""[^"]*', 
-         'def process_exit(self, exit_reason="manual", exit_price=None):\n        """Process exit consistently for all exit types (stoploss, target, time, market close)"""\n'),
-        (r'def check_partial_exit\([^)]*\):\s*"""[^"]*',
-         'def check_partial_exit(self):\n        """Check and execute partial exits based on predefined rules"""\n'),
-        (r'def run_diagnostic\([^)]*\):\s*"""[^"]*', 
-         'def run_diagnostic(self):\n        """Run a self-diagnostic check to verify key components are functioning"""\n'),
-        (r'def run_strategy\([^)]*\):\s*"""[^"]*', 
-         'def run_strategy(self, force_analysis=False):\n        """Main function to run the strategy"""\n'),
-        (r'def save_trade_history\([^)]*\):\s*"""[^"]*', 
-         'def save_trade_history(self):\n        """Save trade history to both CSV and Excel files with proper error handling"""\n'),
-        (r'def record_trade_metrics\([^)]*\):\s*"""[^"]*', 
-         'def record_trade_metrics(self):\n        """Record trade performance metrics for analysis and reporting"""\n'),
-        (r'def update_aggregate_stats\([^)]*\):\s*"""[^"]*', 
-         'def update_aggregate_stats(self):\n        """Update aggregate statistics file with new trade data"""\n'),
-        (r'def get_current_time\([^)]*\):\s*"""[^"]*', 
-         'def get_current_time(self):\n        """Get current time in IST timezone"""\n'),
-        (r'def wait_for_market_open\([^)]*\):\s*"""[^"]*', 
-         'def wait_for_market_open(self):\n        """Wait for market to open and then run the strategy"""\n'),
-        (r'def quick_exit_check\([^)]*\):\s*"""[^"]*', 
-         'def quick_exit_check(self):\n        """Check for immediate exit conditions (SL/target) on every monitoring loop iteration"""\n'),
-        (r'def generate_daily_report\([^)]*\):\s*"""[^"]*', 
-         'def generate_daily_report(self):\n        """Generate a summary report of the day\'s trading activity"""\n')
-    ]
-    
-    new_content = content
-    
-    # Apply the pattern replacements
-    for pattern, replacement in method_patterns:
-        new_content = re.sub(pattern, replacement, new_content, flags=re.DOTALL)
-    
-    # Second fix: Directly target specific lines with known issues 
-    # (e.g. unterminated strings, single quotes within double quotes, etc)
-    lines = new_content.split('\n')
-    fixed_lines = []
-    
-    # Flag to track if we're in a multiline docstring
-    in_docstring = False
-    
-    for i, line in enumerate(lines):
-        # Handle unterminated triple quotes
-        if '"""' in line:
-            quote_count = line.count('"""')
-            if quote_count % 2 == 1:  # Odd number of triple quotes
-                if not in_docstring:  # Opening quote
-                    in_docstring = True
-                    if not line.strip().endswith('"""'):  # If not terminated in the same line
-                        line = line + '"""'
-                        in_docstring = False
-                else:  # Closing quote
-                    in_docstring = False
-        
-        # Fix indentation issues - ensure consistent indentation pattern
-        if re.match(r'^\s*def\s+\w+', line) and not line.strip().endswith(':'):
-            line = line + ':'
-        
-        # Add the fixed line
-        fixed_lines.append(line)
-    
-    # Convert back to a string
-    fixed_content = '\n'.join(fixed_lines)
-      # Final fix: Ensure any remaining broken docstring patterns are fixed
-    fixed_content = re.sub(r'"""([^"]*?)$', r'"""\1"""', fixed_content, flags=re.MULTILINE)
-    
-    # Add the missing update_trailing_stoploss method if it doesn't exist
-    if "def update_trailing_stoploss" not in fixed_content:
-        print("Adding missing update_trailing_stoploss method")
-        
-        # Define the method
-        trailing_sl_method = '''
+# Canonical signature + single-line docstring for each method we know how to repair
+METHOD_DOCSTRINGS = {
+    'update_trailing_stoploss':
+        'def update_trailing_stoploss(self, current_price):\n        """Update the trailing stoploss based on current price and profit percentage"""',
+    'process_exit':
+        'def process_exit(self, exit_reason="manual", exit_price=None):\n        """Process exit consistently for all exit types (stoploss, target, time, market close)"""',
+    'check_partial_exit':
+        'def check_partial_exit(self):\n        """Check and execute partial exits based on predefined rules"""',
+    'run_diagnostic':
+        'def run_diagnostic(self):\n        """Run a self-diagnostic check to verify key components are functioning"""',
+    'run_strategy':
+        'def run_strategy(self, force_analysis=False):\n        """Main function to run the strategy"""',
+    'save_trade_history':
+        'def save_trade_history(self):\n        """Save trade history to both CSV and Excel files with proper error handling"""',
+    'record_trade_metrics':
+        'def record_trade_metrics(self):\n        """Record trade performance metrics for analysis and reporting"""',
+    'update_aggregate_stats':
+        'def update_aggregate_stats(self):\n        """Update aggregate statistics file with new trade data"""',
+    'get_current_time':
+        'def get_current_time(self):\n        """Get current time in IST timezone"""',
+    'wait_for_market_open':
+        'def wait_for_market_open(self):\n        """Wait for market to open and then run the strategy"""',
+    'quick_exit_check':
+        'def quick_exit_check(self):\n        """Check for immediate exit conditions (SL/target) on every monitoring loop iteration"""',
+    'generate_daily_report':
+        'def generate_daily_report(self):\n        """Generate a summary report of the day\'s trading activity"""',
+}
+
+# Tokens allowed between a def's colon and its docstring
+_SKIP_TOKENS = {tokenize.NEWLINE, tokenize.NL, tokenize.INDENT, tokenize.COMMENT}
+
+# Inserted before process_exit when strategy.py has no update_trailing_stoploss
+TRAILING_SL_METHOD = '''
     def update_trailing_stoploss(self, current_price):
         """Update the trailing stoploss based on current price and profit percentage"""
         if not self.active_trade:
@@ -136,28 +83,189 @@ def fix_docstring_issue():
             return False
             
 '''
-        
-        # Find a suitable place to insert the method (before process_exit)
-        if 'def process_exit' in fixed_content:
-            insert_pos = fixed_content.find('def process_exit')
-            if insert_pos > 0:
-                # Insert the method at the found position
-                fixed_content = fixed_content[:insert_pos] + trailing_sl_method + fixed_content[insert_pos:]
-                print("Successfully added update_trailing_stoploss method")
+
+
+def _line_offsets(content):
+    """Character offset of the start of every line (split the same way tokenize reads them)"""
+    offsets = [0, 0]  # tokenize rows are 1-based
+    for line in io.StringIO(content):
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def _scan_methods(content):
+    """
+    Walk the token stream once and collect the edits to apply.
+
+    Returns (splices, method_lines): a list of (start, end, replacement) splices
+    sorted by offset, and the offset of the line holding the first def of each
+    method name. Raises tokenize.TokenError if a string is left unterminated, and
+    IndentationError on an inconsistent dedent.
+    """
+    offsets = _line_offsets(content)
+    splices = []
+    method_lines = {}
+    state = None
+    def_start = fname = missing_colon = None
+    depth = 0
+
+    for tok in tokenize.generate_tokens(io.StringIO(content).readline):
+        if state is None:
+            if tok.type == tokenize.NAME and tok.string == 'def':
+                def_start = offsets[tok.start[0]] + tok.start[1]
+                state = 'def'
+        elif state == 'def':
+            if tok.type == tokenize.NAME:
+                fname, depth, missing_colon, state = tok.string, 0, None, 'signature'
+                method_lines.setdefault(fname, offsets[tok.start[0]])
             else:
-                print("Could not find a suitable insertion point for update_trailing_stoploss method")
+                state = None
+        elif state == 'signature':
+            if tok.type == tokenize.OP and tok.string in '([{':
+                depth += 1
+            elif tok.type == tokenize.OP and tok.string in ')]}':
+                depth -= 1
+            elif depth == 0 and tok.type == tokenize.OP and tok.string == ':':
+                state = 'body'
+            elif depth == 0 and tok.type == tokenize.NEWLINE:
+                # Signature ended without a colon
+                pos = offsets[tok.start[0]] + tok.start[1]
+                missing_colon = (pos, pos, ':')
+                state = 'body'
+        elif state == 'body':
+            if tok.type in _SKIP_TOKENS:
+                continue
+            if tok.type == tokenize.STRING and fname in METHOD_DOCSTRINGS:
+                end = offsets[tok.end[0]] + tok.end[1]
+                splices.append((def_start, end, METHOD_DOCSTRINGS[fname]))
+            elif missing_colon:
+                splices.append(missing_colon)
+            state = None
+            # The token that ended the body check may itself start a new def
+            if tok.type == tokenize.NAME and tok.string == 'def':
+                def_start = offsets[tok.start[0]] + tok.start[1]
+                state = 'def'
+
+    return splices, method_lines
+
+
+def _close_unterminated(content, pos):
+    """Terminate the string opened at tokenize position pos at the end of its line"""
+    offsets = _line_offsets(content)
+    line_end = content.find('\n', offsets[pos[0]] + pos[1])
+    if line_end < 0:
+        line_end = len(content)
+    return content[:line_end] + '"""' + content[line_end:]
+
+
+def fix_docstring_issue():
+    file_path = r'c:\vs code projects\finalized strategies\src\strategy.py'
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as src:
+            content = src.read()
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return
+    
+    # Fast path: a file that already compiles and has the trailing SL method
+    # needs no repair
+    try:
+        compile(content, file_path, 'exec')
+        if 'def update_trailing_stoploss' in content:
+            print("File parses cleanly; skipping syntax fixes")
+            return True
+    except SyntaxError as e:
+        print(f"Syntax error at line {e.lineno}: {e.msg}")
+    
+    # Tokenize once to locate every known method docstring and any def missing
+    # its colon. Unterminated strings stop the tokenizer, so close them where they
+    # were opened and scan again.
+    fixed_content = content
+    closed = set()
+    while True:
+        try:
+            splices, method_lines = _scan_methods(fixed_content)
+            break
+        except tokenize.TokenError as e:
+            pos = e.args[1] if len(e.args) > 1 else None
+            if not isinstance(pos, tuple) or pos in closed:
+                print(f"Could not repair unterminated string: {e}")
+                splices, method_lines = [], {}
+                break
+            closed.add(pos)
+            print(f"Closing unterminated string opened at line {pos[0]}")
+            fixed_content = _close_unterminated(fixed_content, pos)
+        except (IndentationError, SyntaxError) as e:
+            # generate_tokens raises these on an inconsistent dedent; leave the
+            # method docstrings alone rather than failing
+            print(f"Could not tokenize file: {e}")
+            splices, method_lines = [], {}
+            break
+    
+    # Add the missing update_trailing_stoploss method if it doesn't exist,
+    # inserting it at the start of the line that defines process_exit
+    if 'update_trailing_stoploss' not in method_lines:
+        print("Adding missing update_trailing_stoploss method")
+        if 'process_exit' in method_lines:
+            insert_pos = method_lines['process_exit']
+            splices.append((insert_pos, insert_pos, TRAILING_SL_METHOD))
+            splices.sort(key=lambda splice: splice[:2])
+            print("Successfully added update_trailing_stoploss method")
         else:
             print("Could not find process_exit method to insert update_trailing_stoploss before it")
     
-    # Write the fixed content back to the file
+    # Apply the splices in one pass over the text
+    parts = []
+    last = 0
+    for start, end, replacement in splices:
+        parts.append(fixed_content[last:start])
+        parts.append(replacement)
+        last = end
+    parts.append(fixed_content[last:])
+    fixed_content = ''.join(parts)
+    
+    if fixed_content == content:
+        print("No changes needed")
+        return True
+    
+    # Back up only once there is something to change. One stat for both the
+    # backup name and the size check
+    st = os.stat(file_path)
+    backup_path = file_path + '.complete_syntax_fix_' + str(int(st.st_mtime))
+    
+    if os.path.exists(backup_path) and os.path.getsize(backup_path) == st.st_size:
+        print(f"Backup already current at {backup_path}")
+    else:
+        print(f"Creating backup at {backup_path}")
+        try:
+            # A hardlink shares the original's data without copying it. The fixed
+            # content is written to a new file and renamed over file_path below,
+            # so the backup keeps the original bytes.
+            os.link(file_path, backup_path)
+        except OSError:
+            shutil.copy2(file_path, backup_path)
+    
+    # Write the fixed content to a new file and swap it in, leaving the
+    # (possibly hardlinked) backup untouched
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write(fixed_content)
+        os.replace(tmp_path, file_path)
         print("Fixed syntax issues in the file")
         return True
     except Exception as e:
         print(f"Error writing to file: {e}")
         return False
 
+def _reexec_under_pypy():
+    """Re-run this script under pypy3 when it is installed; the string/token work is JIT friendly"""
+    if 'pypy' in sys.version.lower() or os.environ.get('OI_REEXEC') == '1':
+        return
+    if shutil.which('pypy3'):
+        os.environ['OI_REEXEC'] = '1'
+        os.execvp('pypy3', ['pypy3', os.path.abspath(__file__), *sys.argv[1:]])
+
 if __name__ == "__main__":
+    _reexec_under_pypy()
     fix_docstring_issue()
@@ -8,63 +8,105 @@ This script specifically fixes:
 """
 import re
 import os
+import bisect
 import shutil
+from collections import defaultdict
 from datetime import datetime
 
-def fix_docstring_issues():
-    strategy_file = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = f"{strategy_file}.backup_{timestamp}"
-    
-    # Create backup with timestamp
-    print(f"Creating backup of {strategy_file} to {backup_file}")
-    shutil.copy2(strategy_file, backup_file)
-    
-    try:
-        with open(strategy_file, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return False
+# Patterns are compiled once at import rather than on every call.
+# The quote fixes share one alternation so the file is scanned once:
+#   mixed1 - docstring followed by a comment and a stray closing quote
+#   mixed2 - docstring followed by a comment (left as is)
+#   unterm - docstring left open at the end of a line
+#   sixq   - doubled triple quotes
+# The file is processed as raw bytes, so all patterns are bytes patterns.
+_QUOTE_FIXES = re.compile(
+    rb'(?P<mixed1>"""(?P<doc1>[^"]*)"""\s*#[^"]*?""")'
+    rb'|(?P<mixed2>"""[^"]*"""\s*#[^"]*)'
+    rb'|(?P<unterm>"""(?P<doc3>[^"]*)$)'
+    rb'|(?P<sixq>"{6})',
+    re.MULTILINE
+)
+_METHOD = re.compile(rb'def\s+(\w+)\s*\(')
+_RESET_STATE = re.compile(rb'def reset_state\(self\):.*?self\.highest_call_oi_strike = None', re.DOTALL)
+
+# Methods whose docstring is followed by a comment and a stray closing quote
+_PROBLEM_METHODS = {
+    'reset_state': re.compile(rb'def reset_state\(self\):[^"]*?"""[^"]*?""".*?#.*?"""', re.DOTALL),
+    'initialize_day': re.compile(rb'def initialize_day\(self\):[^"]*?"""[^"]*?""".*?#.*?"""', re.DOTALL),
+    'identify_high_oi_strikes': re.compile(rb'def identify_high_oi_strikes\(self\):[^"]*?"""[^"]*?""".*?#.*?"""', re.DOTALL),
+    '_find_suitable_strikes': re.compile(rb'def _find_suitable_strikes\([^)]*\):[^"]*?"""[^"]*?""".*?#.*?"""', re.DOTALL),
+}
+
+# Known damage left behind by earlier edits; a file with none of these, no
+# duplicate defs and an update_trailing_stoploss method is already clean
+_ISSUE_MARKERS = (
+    b'""""""',
+    b'# OI analysis results"""',
+)
+
+def _fix_quotes(m):
+    """Replacement for a _QUOTE_FIXES match"""
+    if m.group('mixed1') is not None:
+        return b'"""' + m.group('doc1') + b'"""'
+    if m.group('unterm') is not None:
+        # $ matches before \n only, so keep a CRLF file's \r after the closing quote
+        doc = m.group('doc3')
+        cr = b'\r' if doc.endswith(b'\r') else b''
+        doc = doc[:len(doc) - len(cr)]
+        if doc.strip():
+            return b'"""' + doc + b'"""' + cr
+    if m.group('sixq') is not None:
+        return b'"""'
+    # mixed2 is already well formed, and a bare closing quote at the end of a
+    # line is not unterminated
+    return m.group(0)
+
+def _strip_trailing_comment(m):
+    """Replacement for a _PROBLEM_METHODS match: keep the def and its docstring"""
+    head, doc, _ = m.group(0).split(b'"""', 2)
+    return head + b'"""' + doc + b'"""'
+
+def is_clean(content):
+    """True if strategy.py content has none of the issues fix_content repairs"""
+    method_names = _METHOD.findall(content)
+    return (b'def update_trailing_stoploss' in content
+            and not any(marker in content for marker in _ISSUE_MARKERS)
+            and len(set(method_names)) == len(method_names))
+
+def fix_content(content):
+    """Apply every docstring/duplicate-method fix to strategy.py content (bytes)"""
+    # Inserted code uses the file's own line endings
+    eol = b'\r\n' if b'\r\n' in content else b'\n'
         
-    # 1. Fix mixed docstrings and comments (most critical issue)
+    # 1. Fix mixed docstrings and comments (most critical issue), unterminated
+    # docstrings and excessive quotes in docstring terminations in one pass
     # Example: """Reset all state variables for a clean start"""        # OI analysis results"""
-    content = re.sub(r'"""([^"]*)"""(\s*#[^"]*?)"""', r'"""\1"""', content)
-    content = re.sub(r'"""([^"]*)"""(\s*#[^"]*)', r'"""\1"""\2', content)
+    # Every alternative needs a triple quote, so a plain substring test can skip the pass
+    if b'"""' in content:
+        content = _QUOTE_FIXES.sub(_fix_quotes, content)
     
     # 2. Fix specific problematic method docstrings
-    problematic_methods = {
-        'reset_state': r'def reset_state\(self\):[^"]*?"""[^"]*?""".*?#.*?"""',
-        'initialize_day': r'def initialize_day\(self\):[^"]*?"""[^"]*?""".*?#.*?"""',
-        'identify_high_oi_strikes': r'def identify_high_oi_strikes\(self\):[^"]*?"""[^"]*?""".*?#.*?"""',
-        '_find_suitable_strikes': r'def _find_suitable_strikes\([^)]*\):[^"]*?"""[^"]*?""".*?#.*?"""'
-    }
-    
-    for method, pattern in problematic_methods.items():
-        if re.search(pattern, content, re.DOTALL):
-            fixed = re.sub(pattern, lambda m: m.group(0).split('"""', 2)[0] + '"""' + m.group(0).split('"""', 2)[1] + '"""', content, flags=re.DOTALL)
-            if fixed != content:
+    for method, pattern in _PROBLEM_METHODS.items():
+        if f'def {method}('.encode() in content:
+            fixed, count = pattern.subn(_strip_trailing_comment, content)
+            if count and fixed != content:
                 content = fixed
                 print(f"Fixed problematic docstring in method: {method}")
     
     # 3. Fix reset_state specifically (line 103)
-    reset_state_fix = '''def reset_state(self):
+    reset_state_fix = b'''def reset_state(self):
         """Reset all state variables for a clean start"""
         # OI analysis results
         self.highest_put_oi_strike = None
-        self.highest_call_oi_strike = None'''
+        self.highest_call_oi_strike = None'''.replace(b'\n', eol)
         
-    content = re.sub(r'def reset_state\(self\):.*?self\.highest_call_oi_strike = None', reset_state_fix, content, flags=re.DOTALL)
-    
-    # 4. Fix all unterminated docstrings
-    content = re.sub(r'"""([^"]*)$', r'"""\1"""', content, flags=re.MULTILINE)
+    if b'def reset_state(self):' in content:
+        content = _RESET_STATE.sub(reset_state_fix, content)
     
-    # 5. Fix excessive quotes in docstring terminations
-    content = re.sub(r'"{6}', r'"""', content)
-    
-    # 6. Ensure update_trailing_stoploss method exists
-    if 'def update_trailing_stoploss' not in content:
-        trailing_sl_method = '''
+    # 4. Ensure update_trailing_stoploss method exists
+    if b'def update_trailing_stoploss' not in content:
+        trailing_sl_method = b'''
     def update_trailing_stoploss(self, current_price):
         """Update the trailing stoploss based on current price and profit percentage"""
         if not self.active_trade:
@@ -104,75 +146,126 @@ def fix_docstring_issues():
         else:
             logging.info(f"TRAILING SL DEBUG | [LONG] No update: potential_stoploss ({potential_stoploss}) <= current_sl ({current_sl}) or original_stoploss ({original_stoploss})")
             return False
-'''
+'''.replace(b'\n', eol)
 
         # Find a good position to insert it (before process_exit if it exists, otherwise at the end of the class)
-        process_exit_pos = content.find('def process_exit')
+        process_exit_pos = content.find(b'def process_exit')
         if process_exit_pos > 0:
             content = content[:process_exit_pos] + trailing_sl_method + content[process_exit_pos:]
             print("Added missing update_trailing_stoploss method")
         else:
             # Try to find the end of the class to insert there
-            class_end = content.rfind('\n\n')
+            class_end = content.rfind(b'\n\n')
             if class_end > 0:
                 content = content[:class_end] + trailing_sl_method + content[class_end:]
                 print("Added missing update_trailing_stoploss method at end of class")
     else:
         print("update_trailing_stoploss method already exists")
     
-    # 7. Find duplicate method definitions and remove them
-    method_pattern = r'def\s+(\w+)\s*\('
-    method_matches = list(re.finditer(method_pattern, content))
-    method_names = [match.group(1) for match in method_matches]
+    # 5. Find duplicate method definitions and remove them
+    # Keep just (name, offset) pairs rather than the Match objects
+    method_info = [(m.group(1).decode('ascii'), m.start()) for m in _METHOD.finditer(content)]
+    method_names = [name for name, _ in method_info]
     
     # Identify duplicates
-    duplicate_methods = {}
+    positions = defaultdict(list)
     for i, name in enumerate(method_names):
-        if name in duplicate_methods:
-            duplicate_methods[name].append(i)
-        else:
-            duplicate_methods[name] = [i]
+        positions[name].append(i)
     
     # Keep only methods with duplicates
-    duplicate_methods = {name: indices for name, indices in duplicate_methods.items() if len(indices) > 1}
+    duplicate_methods = {name: indices for name, indices in positions.items() if len(indices) > 1}
     
     if duplicate_methods:
         print(f"Found duplicate methods: {list(duplicate_methods.keys())}")
         
-        # Split content into lines for easier processing
-        lines = content.split('\n')
-        lines_to_remove = set()
+        # Character ranges to drop, each running from the start of a duplicate
+        # def's line to the start of the next def's line (or end of file)
+        remove_ranges = []
+        
+        # Sorted newline offsets; the line of an offset is a binary search away
+        newlines = [m.start() for m in re.finditer(rb'\n', content)]
         
         for method_name, indices in duplicate_methods.items():
             # Skip the first occurrence (keep it)
             for duplicate_idx in indices[1:]:
-                match = method_matches[duplicate_idx]
-                method_start_line = content[:match.start()].count('\n')
+                def_start = method_info[duplicate_idx][1]
+                method_start = content.rfind(b'\n', 0, def_start) + 1
+                method_start_line = bisect.bisect_left(newlines, def_start)
                 
                 # Find the end of this method (next method or end of file)
                 next_method_idx = duplicate_idx + 1
-                method_end_line = len(lines)
-                
-                if next_method_idx < len(method_matches):
-                    next_method_start = method_matches[next_method_idx].start()
-                    method_end_line = content[:next_method_start].count('\n')
+                method_end = len(content)
+                method_end_line = len(newlines) + 1
                 
-                # Mark lines to remove
-                for i in range(method_start_line, method_end_line):
-                    lines_to_remove.add(i)
+                if next_method_idx < len(method_info):
+                    next_method_start = method_info[next_method_idx][1]
+                    method_end = content.rfind(b'\n', 0, next_method_start) + 1
+                    method_end_line = bisect.bisect_left(newlines, next_method_start)
                 
+                remove_ranges.append((method_start, method_end))
                 print(f"Marked duplicate method '{method_name}' (lines {method_start_line}-{method_end_line}) for removal")
         
-        # Remove marked lines
-        if lines_to_remove:
-            new_lines = [line for i, line in enumerate(lines) if i not in lines_to_remove]
-            content = '\n'.join(new_lines)
-            print(f"Removed {len(lines_to_remove)} lines containing duplicate methods")
+        # Merge the ranges and rebuild the content from the slices in between
+        if remove_ranges:
+            kept = []
+            removed_lines = 0
+            pos = 0
+            for start, end in sorted(remove_ranges):
+                if end <= pos:
+                    continue
+                start = max(start, pos)
+                kept.append(content[pos:start])
+                removed_lines += content.count(b'\n', start, end)
+                pos = end
+            kept.append(content[pos:])
+            content = b''.join(kept)
+            print(f"Removed {removed_lines} lines containing duplicate methods")
+    
+    return content
+
+def fix_docstring_issues():
+    strategy_file = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_file = f"{strategy_file}.backup_{timestamp}"
+    
+    try:
+        # Raw bytes: every pattern and marker is ASCII, so no decode/encode is needed
+        with open(strategy_file, 'rb') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return False
+    original = content
+    
+    # An already clean file needs no backup, no passes and no rewrite
+    if is_clean(content):
+        print(f"{strategy_file} is already clean, nothing to fix")
+        return True
+    
+    # Create backup with timestamp
+    print(f"Creating backup of {strategy_file} to {backup_file}")
+    try:
+        # A hardlink shares the original's data without copying it. The fixed
+        # content is written to a new file and renamed over strategy_file below,
+        # so the backup keeps the original bytes.
+        os.link(strategy_file, backup_file)
+    except OSError:
+        shutil.copy2(strategy_file, backup_file)
+    
+    content = fix_content(content)
+    
+    # Leave the file (and its mtime) alone if no pass changed anything
+    if content == original:
+        print(f"No changes needed in {strategy_file}")
+        return True
     
-    # Write fixed content back to file
+    # Write fixed content to a new file and swap it in; writing in place would
+    # also overwrite a hardlinked backup
+    tmp_file = strategy_file + '.tmp'
     try:
-        with open(strategy_file, 'w', encoding='utf-8') as f:
+        with open(tmp_file, 'wb') as f:
             f.write(content)
+        os.replace(tmp_file, strategy_file)
         print(f"Successfully fixed docstring issues in {strategy_file}")
         return True
     except Exception as e:
@@ -3,22 +3,47 @@ Fix for specific syntax error at line 103 in strategy.py
 """
 import os
 
+def fix_line(line):
+    """Return the replacement for the problematic line, or None if line is fine"""
+    if b'"""Reset all state variables for a clean start"""' in line and b'# OI analysis results"""' in line:
+        eol = b'\r\n' if line.endswith(b'\r\n') else b'\n'
+        return (b'        """Reset all state variables for a clean start"""' + eol +
+                b'        # OI analysis results' + eol)
+    return None
+
+def fix_content(content):
+    """Apply the line 103 fix to in-memory strategy.py content (bytes)"""
+    lines = content.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        fixed = fix_line(line)
+        if fixed is not None:
+            lines[i] = fixed
+            print(f"Fixed problematic line {i+1}")
+    return b''.join(lines)
+
 def fix_line_103():
     strategy_file = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
     
-    # Read the file
-    with open(strategy_file, 'r', encoding='utf-8', errors='replace') as f:
-        lines = f.readlines()
-    
-    # Find the problematic line
-    for i, line in enumerate(lines):
-        if '"""Reset all state variables for a clean start"""' in line and '# OI analysis results"""' in line:
-            lines[i] = '        """Reset all state variables for a clean start"""\n        # OI analysis results\n'
-            print(f"Fixed problematic line {i+1}")
+    # Stream the file as raw bytes into a temp file, rewriting the problematic
+    # line as it passes, then swap the temp file in
+    tmp_file = strategy_file + '.tmp'
+    fixed = False
+    with open(strategy_file, 'rb') as fin, open(tmp_file, 'wb') as fout:
+        for i, line in enumerate(fin):
+            replacement = fix_line(line)
+            if replacement is not None:
+                fout.write(replacement)
+                print(f"Fixed problematic line {i+1}")
+                fixed = True
+            else:
+                fout.write(line)
     
-    # Write the file back
-    with open(strategy_file, 'w', encoding='utf-8') as f:
-        f.writelines(lines)
+    # Only swap the copy in if a line was rewritten, so an unchanged file keeps its mtime
+    if not fixed:
+        os.remove(tmp_file)
+        print("Problematic line not found, file left unchanged")
+        return
+    os.replace(tmp_file, strategy_file)
     
     print("File updated successfully")
 
@@ -2,29 +2,42 @@
 Super focused fix for line 103 syntax error
 """
 
-def fix_line_103():
-    file_path = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
-    
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
-    
+def fix_content(content):
+    """Apply the line 103 fix to in-memory strategy.py content (bytes)"""
     # Split into individual lines for precise editing
-    lines = content.split('\n')
+    lines = content.split(b'\n')
     
     # Look for the problematic line
     for i in range(len(lines)):
         # Exact match for the problematic line
-        if '"""Reset all state variables for a clean start"""        # OI analysis results"""' in lines[i]:
+        if b'"""Reset all state variables for a clean start"""        # OI analysis results"""' in lines[i]:
             print(f"Found problematic line at line {i+1}")
-            # Replace with fixed version
-            lines[i] = '        """Reset all state variables for a clean start"""'
-            lines.insert(i+1, '        # OI analysis results')
+            # Replace with fixed version, keeping a CRLF file's \r
+            cr = b'\r' if lines[i].endswith(b'\r') else b''
+            lines[i] = b'        """Reset all state variables for a clean start"""' + cr
+            lines.insert(i+1, b'        # OI analysis results' + cr)
             print("Fixed line by splitting into two lines")
-            break
+            return b'\n'.join(lines)
+    
+    return content
+
+def fix_line_103():
+    file_path = 'c:\\vs code projects\\finalized strategies\\src\\strategy.py'
+    
+    # Read the file as raw bytes; the marker is ASCII so no decoding is needed
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    
+    fixed_content = fix_content(content)
+    
+    # Nothing to write back if the line was not found
+    if fixed_content == content:
+        print("Problematic line not found, file left unchanged")
+        return
     
     # Write the fixed content back
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+    with open(file_path, 'wb') as f:
+        f.write(fixed_content)
     
     print("File updated successfully")
 
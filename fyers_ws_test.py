@@ -1,7 +1,13 @@
 from fyers_apiv3.FyersWebsocket import data_ws
-import time
+import threading
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Read access token from file
 with open('access.txt') as f:
     access_token = f.read().strip()
@@ -9,7 +15,7 @@ with open('access.txt') as f:
 # Read client_id from config.yaml if available
 try:
     with open('config/config.yaml') as ymlfile:
-        config = yaml.safe_load(ymlfile)
+        config = yaml.load(ymlfile, Loader=_Loader)
         client_id = config['fyers']['client_id']
 except Exception:
     client_id = 'YOUR_CLIENT_ID'  # Fallback, replace if needed
@@ -23,8 +29,18 @@ symbols = [
     "NSE:NIFTY2580724600PE"
 ]
 
+# Stop as soon as this many ticks have arrived instead of always waiting out the timeout
+TARGET_MSGS = 10
+WAIT_TIMEOUT = 60
+done = threading.Event()
+msg_count = 0
+
 def onmessage(msg):
+    global msg_count
     print(f"Custom: {msg}")
+    msg_count += 1
+    if msg_count >= TARGET_MSGS:
+        done.set()
 
 def onerror(msg):
     print(f"Error: {msg}")
@@ -52,5 +68,9 @@ fyers_socket = data_ws.FyersDataSocket(
 
 fyers_socket.connect()
 
-# Keep the script running for a while to receive ticks
-time.sleep(60)
+# Wait until enough ticks arrive (or the timeout expires), then disconnect
+if done.wait(timeout=WAIT_TIMEOUT):
+    print(f"Received {msg_count} messages")
+else:
+    print(f"Timed out after {WAIT_TIMEOUT}s with {msg_count} messages")
+fyers_socket.close_connection()
@@ -22,30 +22,19 @@ for handler in logger.handlers[:]:
 # Create formatter
 formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 
-# Add console handler with stream lock for thread safety
+# Add console handler (handlers create their own lock in __init__)
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
-console_handler.createLock()
 logger.addHandler(console_handler)
 
-# Add file handler for main log with file lock
-file_handler = logging.handlers.RotatingFileHandler(
-    'logs/strategy_run.log', 
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=5  # Keep 5 backup files
-)
-file_handler.setFormatter(formatter)
-file_handler.createLock()
-logger.addHandler(file_handler)
-
-# Add file handler for strategy log with file lock
+# Add a single file handler for the strategy log; the dashboard and the log
+# sanitizers read logs/strategy.log, so records are written there once
 strategy_log_handler = logging.handlers.RotatingFileHandler(
     'logs/strategy.log', 
     maxBytes=10*1024*1024,  # 10MB
     backupCount=5  # Keep 5 backup files
 )
 strategy_log_handler.setFormatter(formatter)
-strategy_log_handler.createLock()
 logger.addHandler(strategy_log_handler)
 
 logging.info("Logging configured with console and file handlers")
@@ -54,10 +43,10 @@ logging.info("Logging configured with console and file handlers")
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
-    logging.info(f"Added current directory to Python path: {current_dir}")
+    logging.info("Added current directory to Python path: %s", current_dir)
 
 # Print Python path for debugging
-logging.info(f"Python path includes: {sys.path}")
+logging.info("Python path includes: %s", sys.path)
 
 def monkey_patch_option_symbol_conversion():
     """Apply symbol conversion to all relevant functions"""
@@ -66,6 +55,13 @@ def monkey_patch_option_symbol_conversion():
         from src.symbol_formatter import convert_option_symbol_format
         import src.nse_data_new
         import pandas as pd
+        from functools import lru_cache
+        
+        # Option chains repeat the same symbols on every fetch, so memoize the
+        # conversion. It can fall back to today's date, so the date is part of the key.
+        @lru_cache(maxsize=4096)
+        def convert_cached(symbol, day):
+            return convert_option_symbol_format(symbol)
         
         # Save original function
         original_get_option_chain = src.nse_data_new.get_nifty_option_chain
@@ -76,20 +72,23 @@ def monkey_patch_option_symbol_conversion():
             
             if isinstance(result, pd.DataFrame) and 'symbol' in result.columns:
                 # Log original symbols first
-                if not result.empty:
+                if not result.empty and logger.isEnabledFor(logging.INFO):
                     logging.info("Original option symbols:")
                     for i, symbol in enumerate(result['symbol'].iloc[:5]):
-                        logging.info(f"  {i+1}. {symbol}")
+                        logging.info("  %d. %s", i + 1, symbol)
                 
                 # Apply the conversion to all symbols
                 logging.info("Converting option symbols to Fyers API format")
-                result['symbol'] = result['symbol'].apply(convert_option_symbol_format)
+                # Convert each unique symbol once and map the results back
+                today = datetime.date.today()
+                mapping = {s: convert_cached(s, today) for s in result['symbol'].unique()}
+                result['symbol'] = result['symbol'].map(mapping)
                 
                 # Log the converted symbols
-                if not result.empty:
+                if not result.empty and logger.isEnabledFor(logging.INFO):
                     logging.info("Converted option symbols:")
                     for i, symbol in enumerate(result['symbol'].iloc[:5]):
-                        logging.info(f"  {i+1}. {symbol}")
+                        logging.info("  %d. %s", i + 1, symbol)
             
             return result
             
@@ -99,7 +98,7 @@ def monkey_patch_option_symbol_conversion():
         
         return True
     except Exception as e:
-        logging.error(f"Failed to apply option symbol conversion: {e}")
+        logging.error("Failed to apply option symbol conversion: %s", e)
         return False
 
 def apply_websocket_patch():
@@ -118,7 +117,7 @@ def apply_websocket_patch():
         
         return True
     except Exception as e:
-        logging.error(f"Failed to apply websocket patch: {e}")
+        logging.error("Failed to apply websocket patch: %s", e)
         return False
 
 def run_strategy():
@@ -165,9 +164,7 @@ def run_strategy():
         return True
         
     except Exception as e:
-        import traceback
-        logging.error(f"Error running strategy: {e}")
-        logging.error(traceback.format_exc())
+        logging.exception("Error running strategy: %s", e)
         return False
 
 if __name__ == "__main__":
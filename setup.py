@@ -10,6 +10,12 @@ import subprocess
 import yaml
 import logging
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,7 +54,7 @@ def verify_config():
             return False
             
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_Loader)
             
         required_fields = {
             'fyers': ['client_id', 'secret_key', 'redirect_uri'],
@@ -4,25 +4,35 @@ Simple execution of the strategy to take a trade
 import os
 import sys
 import logging
+import logging.handlers
 import datetime
 import time
 
-# Create logs directory if it doesn't exist
-os.makedirs("logs", exist_ok=True)
+# Importing the src package creates the logs directory (src.LOGS_DIR)
+import src
 
-# Configure more robust logging
+# Configure more robust logging; file records are buffered and written in
+# batches (immediately for errors, and when logging shuts down at exit)
+log_format = '%(asctime)s - %(levelname)s - %(message)s'
+file_handler = logging.handlers.RotatingFileHandler(
+    os.path.join(src.LOGS_DIR, 'simple_run.log'),
+    maxBytes=10*1024*1024,  # 10MB
+    backupCount=3
+)
+# basicConfig only formats the handlers it is given, not the buffer's target
+file_handler.setFormatter(logging.Formatter(log_format))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=log_format,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('logs/simple_run.log')
+        logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=file_handler)
     ]
 )
 
-# Write to a simple output file for debugging
-with open("simple_run_output.txt", "w") as f:
-    f.write(f"Script started at {datetime.datetime.now()}\n")
+# Write to a simple output file for debugging; one buffered handle for the whole run
+output_file = open("simple_run_output.txt", "w", buffering=8192)
+output_file.write(f"Script started at {datetime.datetime.now()}\n")
 
 print("=" * 80)
 print("RUNNING TRADING STRATEGY")
@@ -39,14 +49,12 @@ try:
     
     # Import the fixed strategy
     logging.info("Attempting to import FixedOpenInterestStrategy...")
-    with open("simple_run_output.txt", "a") as f:
-        f.write("Importing FixedOpenInterestStrategy...\n")
+    output_file.write("Importing FixedOpenInterestStrategy...\n")
     
     from src.fixed_strategy_updated import FixedOpenInterestStrategy
     
     logging.info("Import successful")
-    with open("simple_run_output.txt", "a") as f:
-        f.write("Import successful\n")
+    output_file.write("Import successful\n")
     
     # Create an instance
     logging.info("Creating strategy instance...")
@@ -76,5 +84,7 @@ except Exception as e:
     import traceback
     print(f"Error: {e}")
     print(traceback.format_exc())
+finally:
+    output_file.close()
 
 print("=" * 80)
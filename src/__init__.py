@@ -1,2 +1,16 @@
 # This file makes the src directory a Python package
 # allowing imports like 'from src.config import load_config'
+import os
+
+# Directories already created by ensure_dir in this process
+_ensured_dirs = set()
+
+def ensure_dir(path):
+    """Create a directory once per process; later calls skip the filesystem check"""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
+
+# The project's logs directory, created once when the package is first imported
+LOGS_DIR = ensure_dir(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs'))
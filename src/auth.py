@@ -9,20 +9,29 @@ import logging
 import time
 import datetime
 
-# Ensure working directory is project root
+# Files are resolved against the project root rather than the working directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(script_dir, '..'))
-os.chdir(project_root)
+CONFIG_PATH = os.path.join(project_root, 'config', 'config.yaml')
+ACCESS_TOKEN_PATH = os.path.join(project_root, 'access.txt')
 
-# Add the project root directory to Python path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Let 'python src/auth.py' resolve the src package too
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
+from src.config import load_config
+
+# pyotp is only needed for the TOTP helper
+try:
+    import pyotp
+except ImportError:
+    pyotp = None
+
+# Prefer the libyaml-backed dumper when PyYAML was built with it
 try:
-    # Try using package import first (when running as module)
-    from src.config import load_config
-except ModuleNotFoundError:
-    # Fall back to relative import (when running as script)
-    from config import load_config
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeDumper as _SafeDumper
 
 def generate_auth_code(use_totp=False):
     """
@@ -47,29 +56,26 @@ def generate_auth_code(use_totp=False):
     print("Please login and authorize the application...")
     webbrowser.open(auth_url, new=1)
     
+    # The login page asks for a TOTP; print the current one so it can be typed in.
+    # The auth code itself still comes from the redirect URL below.
     if use_totp and config.get('fyers', {}).get('totp_key'):
-        try:
-            import pyotp
-            totp_key = config['fyers']['totp_key']
-            totp = pyotp.TOTP(totp_key).now()
-            print(f"Generated TOTP: {totp}")
-            print("Using TOTP for authentication.")
-            # When using TOTP, the flow is different and requires additional API calls
-            # This is just a placeholder - implement according to Fyers TOTP flow
-        except ImportError:
+        if pyotp is not None:
+            totp = pyotp.TOTP(config['fyers']['totp_key']).now()
+            print(f"Current TOTP for the login page: {totp}")
+        else:
             print("pyotp package not installed. Please install it with: pip install pyotp")
-            print("Falling back to URL redirect method.")
+            print("Enter the TOTP from your authenticator app instead.")
     
     # Get the auth code from the URL
     print("\nAfter authentication, you'll be redirected to a page.")
     print("Please copy the FULL URL from your browser's address bar and paste it below.")
     redirect_url = input("Enter the redirect URL: ")
     
-    # Parse the auth code from the URL
+    # Parse the auth code from the URL's query string (order-independent, handles URL encoding)
     try:
-        if "auth_code=" in redirect_url:
-            auth_code = redirect_url[redirect_url.index('auth_code=')+10:redirect_url.index('&state')]
-        else:
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(redirect_url.strip()).query)
+        auth_code = query.get('auth_code', [None])[0]
+        if not auth_code:
             print("Could not find auth_code in the URL. Please enter it manually.")
             auth_code = input("Enter the auth code: ")
         
@@ -120,14 +126,15 @@ def generate_access_token(use_totp=False):
             config['fyers']['token_expiry'] = expiry_time.strftime('%Y-%m-%d %H:%M:%S')
             
             # Write updated config to file
-            with open('config/config.yaml', 'w') as f:
-                yaml.dump(config, f)
+            with open(CONFIG_PATH, 'w') as f:
+                yaml.dump(config, f, Dumper=_SafeDumper)
+            load_config.cache_clear()
                 
             print(f"Access token generated and saved successfully.")
             print(f"Token valid until: {config['fyers']['token_expiry']}")
             
             # Also save token to access.txt for compatibility with example code
-            with open('access.txt', 'w') as f:
+            with open(ACCESS_TOKEN_PATH, 'w') as f:
                 f.write(response['access_token'])
                 
             return response['access_token']
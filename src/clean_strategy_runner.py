@@ -16,9 +16,8 @@ sys.path.append(project_root)
 from src.log_sanitizer import filter_log_file, find_and_fix_sensitive_logs
 
 def main():
-    # Clean existing logs
-    print("Cleaning existing logs before running strategy...")
-    find_and_fix_sensitive_logs()
+    # Logs are sanitized once after the run; sensitive values only reach them
+    # through this run's logging, so cleaning beforehand is repeated work
     
     # Run the main strategy
     print("Running strategy...")
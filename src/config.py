@@ -1,6 +1,22 @@
 import yaml
 import os
 import sys
+import copy
+from functools import lru_cache
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Parsed configs keyed by absolute path plus the file's mtime and size, so an
+# edited file (e.g. a new access token written by another process) gets a new key
+@lru_cache(maxsize=16)
+def _parse_config(path, mtime_ns, size):
+    # Parse from one string rather than letting the loader pull the stream in pieces
+    with open(path, 'r') as f:
+        return yaml.load(f.read(), Loader=_SafeLoader)
 
 # Make sure the config path is relative to the project root
 def load_config(path=None):
@@ -9,10 +25,16 @@ def load_config(path=None):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.abspath(os.path.join(script_dir, '..'))
         path = os.path.join(project_root, "config", "config.yaml")
+    path = os.path.abspath(path)
     
     try:
-        with open(path, 'r') as f:
-            return yaml.safe_load(f)
+        st = os.stat(path)
+        # Callers modify the returned dict (e.g. auth.py stores the access token),
+        # so never hand out the cached object itself
+        return copy.deepcopy(_parse_config(path, st.st_mtime_ns, st.st_size))
     except FileNotFoundError:
         print(f"Config file not found at {path}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+# Drop all cached configs, e.g. after rewriting config.yaml
+load_config.cache_clear = _parse_config.cache_clear
@@ -1,34 +1,50 @@
 import dash
 from dash import dcc, html, dash_table
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import pandas as pd
+import numpy as np
 import plotly.graph_objs as go
 import os
 import logging
+import logging.handlers
 import datetime
 import time
 import pytz
 import json
-import plotly.express as px
 import sys
+import hashlib
+import threading
+from collections import deque
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Setup logging
+# Importing the src package creates the logs directory before logging opens it
+import src
+
+# Setup logging; rotate so the dashboard log stays bounded, and buffer records
+# so they are written in batches (immediately for errors). The dashboard runs
+# for hours, so the buffer is kept small to stop the file lagging far behind.
+log_format = '%(asctime)s - %(levelname)s - %(message)s'
+file_handler = logging.handlers.RotatingFileHandler(
+    os.path.join(src.LOGS_DIR, 'dashboard.log'),
+    maxBytes=10*1024*1024,  # 10MB
+    backupCount=5  # Keep 5 backup files
+)
+# basicConfig only formats the handlers it is given, not the buffer's target
+file_handler.setFormatter(logging.Formatter(log_format))
 logging.basicConfig(
-    filename='logs/dashboard.log',
+    handlers=[logging.handlers.MemoryHandler(capacity=50, flushLevel=logging.ERROR, target=file_handler)],
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format=log_format
 )
 
 from src.strategy import OpenInterestStrategy, run_strategy
 from src.config import load_config
 from src.token_helper import ensure_valid_token
 from src.fyers_api_utils import get_fyers_client
-
-# Ensure logs directory exists
-os.makedirs('logs', exist_ok=True)
+import src.nse_data_new
 
 # Initialize the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
@@ -41,6 +57,30 @@ strategy = OpenInterestStrategy()
 # Format for dates and times
 date_fmt = "%Y-%m-%d"
 time_fmt = "%H:%M:%S"
+IST = pytz.timezone('Asia/Kolkata')
+
+# Files written by the strategy, found under the project's logs directory
+# wherever the dashboard is started from
+TRADE_HISTORY_PATH = os.path.join(src.LOGS_DIR, 'trade_history.csv')
+TRADE_PERFORMANCE_PATH = os.path.join(src.LOGS_DIR, 'trade_performance.csv')
+
+# Chart layouts never change, so validate them once and keep the plain dict form
+# (with the dark template already expanded). Callbacks return figures as plain
+# dicts, which Dash serializes without plotly's per-object validation.
+_OI_LAYOUT = go.Layout(
+    title='Option Open Interest Distribution (in thousands)',
+    xaxis_title='Strike Price',
+    yaxis_title='Open Interest (x1000)',
+    barmode='relative',
+    bargap=0.1,
+    template='plotly_dark'
+).to_plotly_json()
+_PERF_LAYOUT = go.Layout(
+    title='Cumulative P&L',
+    xaxis_title='Trade Number',
+    yaxis_title='Cumulative P&L',
+    template='plotly_dark'
+).to_plotly_json()
 
 # Define app layout
 app.layout = html.Div([
@@ -118,7 +158,17 @@ app.layout = html.Div([
         id='interval-component',
         interval=2000,  # 2 seconds refresh
         n_intervals=0
-    )
+    ),
+    
+    # Slower refresher for the token/API status and settings, which rarely change
+    dcc.Interval(
+        id='slow-interval',
+        interval=30000,  # 30 seconds refresh
+        n_intervals=0
+    ),
+    
+    # Version of the strategy state; the heavy callbacks only re-render when it changes
+    dcc.Store(id='state-version', data=None)
 ], className='dashboard-container')
 
 
@@ -128,21 +178,83 @@ app.layout = html.Div([
     Input('interval-component', 'n_intervals')
 )
 def update_clock(n):
-    ist_now = datetime.datetime.now(pytz.timezone('Asia/Kolkata'))
-    return html.P(f"Current IST: {ist_now.strftime('%Y-%m-%d %H:%M:%S')}")
+    ist_now = datetime.datetime.now(IST)
+    return html.P(f"Current IST: {ist_now.strftime(f'{date_fmt} {time_fmt}')}")
+
+
+def _file_stamp(path):
+    """(mtime_ns, size) of path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Callback to refresh the strategy data and bump the state version when it changes
+@app.callback(
+    Output('state-version', 'data'),
+    Input('interval-component', 'n_intervals'),
+    State('state-version', 'data')
+)
+def update_state_version(n, current_version):
+    try:
+        # Refresh the OI data once per tick for every callback that shows it
+        strategy.identify_high_oi_strikes()
+        
+        # Fingerprint of the option chain so the OI chart still refreshes as OI
+        # changes during the day (the chain itself is TTL-cached)
+        option_chain = strategy.get_option_chain()
+        if option_chain is not None and not option_chain.empty:
+            chain_key = (len(option_chain), float(option_chain['openInterest'].sum()))
+        else:
+            chain_key = None
+        
+        key = (
+            strategy.highest_put_oi_strike,
+            strategy.highest_call_oi_strike,
+            strategy.put_premium_at_9_20,
+            strategy.call_premium_at_9_20,
+            strategy.put_breakout_level,
+            strategy.call_breakout_level,
+            strategy.active_trade and strategy.active_trade.get('symbol'),
+            _file_stamp(TRADE_HISTORY_PATH),
+            _file_stamp(TRADE_PERFORMANCE_PATH),
+            chain_key,
+        )
+        # A string digest: the store round-trips through the browser as JSON, where
+        # a 64-bit hash() would lose precision and never compare equal
+        version = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+    except Exception as e:
+        logging.error(f"Error updating state version: {str(e)}")
+        raise PreventUpdate
+    
+    # Nothing changed, so none of the dependent callbacks need to run
+    if version == current_version:
+        raise PreventUpdate
+    return version
+
+
+# Components last built by update_oi_info and update_breakout_status, with the
+# values they were built from
+_OI_INFO_CACHE = {'key': None, 'value': None}
+_BREAKOUT_CACHE = {'key': None, 'value': None}
 
 
 # Callback to update OI information
 @app.callback(
     [Output('put-oi-info', 'children'), 
-     Output('call-oi-info', 'children'),
-     Output('breakout-status', 'children')],
-    Input('interval-component', 'n_intervals')
+     Output('call-oi-info', 'children')],
+    Input('state-version', 'data')
 )
-def update_oi_info(n):
+def update_oi_info(version):
     try:
-        # Ensure we have the latest data
-        option_chain = strategy.identify_high_oi_strikes()
+        # The strikes and levels only change when the OI analysis runs again, so
+        # reuse the components built for the same values
+        key = (strategy.highest_put_oi_strike, strategy.put_premium_at_9_20, strategy.put_breakout_level,
+               strategy.highest_call_oi_strike, strategy.call_premium_at_9_20, strategy.call_breakout_level)
+        if _OI_INFO_CACHE['key'] == key:
+            return _OI_INFO_CACHE['value']
         
         # Formatted PUT OI info
         put_info = [
@@ -158,8 +270,31 @@ def update_oi_info(n):
             html.P(f"Breakout Level: {strategy.call_breakout_level}", className='oi-text')
         ]
         
-        # Breakout status
+        _OI_INFO_CACHE['key'] = key
+        _OI_INFO_CACHE['value'] = (put_info, call_info)
+        return put_info, call_info
+    except Exception as e:
+        logging.error(f"Error updating OI info: {str(e)}")
+        return [html.P("Error loading data", className='error-text')], [html.P("Error loading data", className='error-text')]
+
+
+# Callback to check for a breakout; this stays on the interval so monitoring
+# runs every tick even when the OI data has not changed
+@app.callback(
+    Output('breakout-status', 'children'),
+    Input('interval-component', 'n_intervals')
+)
+def update_breakout_status(n):
+    try:
         result = strategy.monitor_for_breakout()
+        trade = strategy.active_trade if result else None
+        key = (bool(result),
+               trade and (trade['symbol'], trade['entry_price'], trade['stoploss'], trade['target']),
+               strategy.put_premium_at_9_20, strategy.put_breakout_level,
+               strategy.call_premium_at_9_20, strategy.call_breakout_level)
+        if _BREAKOUT_CACHE['key'] == key:
+            return _BREAKOUT_CACHE['value']
+        
         if result:
             breakout_status = [
                 html.P(f"BREAKOUT DETECTED: {strategy.active_trade['symbol']}", className='alert-text'),
@@ -174,117 +309,179 @@ def update_oi_info(n):
                 html.P(f"CALL Premium: {strategy.call_premium_at_9_20} (Level: {strategy.call_breakout_level})", className='info-text')
             ]
         
-        return put_info, call_info, breakout_status
+        _BREAKOUT_CACHE['key'] = key
+        _BREAKOUT_CACHE['value'] = breakout_status
+        return breakout_status
     except Exception as e:
-        logging.error(f"Error updating OI info: {str(e)}")
-        return [html.P("Error loading data", className='error-text')], [html.P("Error loading data", className='error-text')], [html.P("Error checking breakout", className='error-text')]
+        logging.error(f"Error checking breakout: {str(e)}")
+        return [html.P("Error checking breakout", className='error-text')]
 
 
 # Callback to update OI distribution chart
 @app.callback(
     Output('oi-distribution-chart', 'figure'),
-    Input('interval-component', 'n_intervals')
+    Input('state-version', 'data')
 )
-def update_oi_chart(n):
+def update_oi_chart(version):
     try:
-        # Get option chain data
-        result = strategy.identify_high_oi_strikes()
-        
         # Create two bar charts, one for puts and one for calls
-        put_data = []
-        call_data = []
+        put_data = None
+        call_data = None
         
         option_chain = strategy.get_option_chain()
         if option_chain is not None and not option_chain.empty:
-            # Filter for PUTs and CALLs
-            put_data = option_chain[option_chain['option_type'] == 'PE']
-            call_data = option_chain[option_chain['option_type'] == 'CE']
-            
-            # Sort by strike price
-            put_data = put_data.sort_values('strikePrice')
-            call_data = call_data.sort_values('strikePrice')
+            # Sort by strike price once, then split PUTs and CALLs in a single pass;
+            # groupby keeps the sorted order within each group
+            chain = option_chain.sort_values('strikePrice', kind='stable')
+            groups = dict(list(chain.groupby('option_type', sort=False)))
+            put_data = groups.get('PE')
+            call_data = groups.get('CE')
         
-        # Create the figure
-        fig = go.Figure()
+        traces = []
         
         # Add PUT OI as negative bars
-        if not put_data.empty:
-            fig.add_trace(go.Bar(
-                x=put_data['strikePrice'],
-                y=-put_data['openInterest']/1000,  # Divide by 1000 for better scaling
-                name='PUT OI',
-                marker_color='red'
-            ))
+        if put_data is not None and not put_data.empty:
+            traces.append({
+                'type': 'bar',
+                'x': put_data['strikePrice'].to_numpy(),
+                'y': -put_data['openInterest'].to_numpy()/1000,  # Divide by 1000 for better scaling
+                'name': 'PUT OI',
+                'marker': {'color': 'red'}
+            })
         
         # Add CALL OI as positive bars
-        if not call_data.empty:
-            fig.add_trace(go.Bar(
-                x=call_data['strikePrice'],
-                y=call_data['openInterest']/1000,  # Divide by 1000 for better scaling
-                name='CALL OI',
-                marker_color='green'
-            ))
+        if call_data is not None and not call_data.empty:
+            traces.append({
+                'type': 'bar',
+                'x': call_data['strikePrice'].to_numpy(),
+                'y': call_data['openInterest'].to_numpy()/1000,  # Divide by 1000 for better scaling
+                'name': 'CALL OI',
+                'marker': {'color': 'green'}
+            })
         
-        # Update layout
-        fig.update_layout(
-            title='Option Open Interest Distribution (in thousands)',
-            xaxis_title='Strike Price',
-            yaxis_title='Open Interest (x1000)',
-            barmode='relative',
-            bargap=0.1,
-            template='plotly_dark'
-        )
-        
-        return fig
+        return {'data': traces, 'layout': _OI_LAYOUT}
     except Exception as e:
         logging.error(f"Error updating OI chart: {str(e)}")
         # Return empty figure in case of error
         return go.Figure()
 
 
+# Rendered output per CSV file, keyed by path: ((mtime_ns, size), component or figure).
+# The trade files only change when a trade closes, so most ticks reuse it.
+_CSV_CACHE = {}
+
+# Column types for trade_history.csv so pandas skips type inference. The symbol
+# repeats across trades, so a category is much smaller than object strings.
+# Columns missing from a file are ignored by read_csv.
+_TRADE_HISTORY_DTYPES = {
+    'symbol': 'category',
+    'paper_trade': 'boolean',
+    'pnl': 'float64',
+}
+
+def _cached_csv_render(path, render, dtype=None):
+    """Return render(DataFrame of path), re-reading the CSV only when the file changes"""
+    # mtime_ns plus size, as in config._parse_config, so a rewrite within the
+    # same timestamp tick is still picked up
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    entry = _CSV_CACHE.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    rendered = render(pd.read_csv(path, dtype=dtype))
+    _CSV_CACHE[path] = (stamp, rendered)
+    return rendered
+
+
+def _render_trade_history(df):
+    """Build the trade history DataTable from trade_history.csv"""
+    if df.empty:
+        return html.P("No trade history available", className='info-text')
+    
+    # Format columns for display
+    df[['entry_time', 'exit_time']] = df[['entry_time', 'exit_time']].fillna('N/A')
+    df['pnl'] = df['pnl'].map('{:.2f}'.format).where(df['pnl'].notna(), 'N/A')
+    # A missing flag counted as a paper trade before the column was typed
+    df['paper_trade'] = np.where(df['paper_trade'].fillna(True).astype(bool), 'Paper', 'Live')
+    
+    # Create a DataTable
+    return dash_table.DataTable(
+        id='trade-table',
+        columns=[{"name": col.replace('_', ' ').title(), "id": col} for col in df.columns],
+        data=df.to_dict('records'),
+        style_header={
+            'backgroundColor': 'rgb(30, 30, 30)',
+            'fontWeight': 'bold'
+        },
+        style_cell={
+            'backgroundColor': 'rgb(50, 50, 50)',
+            'color': 'white',
+            'textAlign': 'left',
+            'padding': '8px'
+        },
+        style_data_conditional=[
+            {
+                'if': {'row_index': 'odd'},
+                'backgroundColor': 'rgb(40, 40, 40)'
+            }
+        ],
+        page_size=10
+    )
+
+
+# pnl column and running P&L total from the last render, so trades appended
+# since then only extend the total instead of re-summing the whole history
+_PERF_CACHE = {
+    'pnl': np.array([], dtype=np.float64),
+    'running': np.array([], dtype=np.float64),
+}
+
+def _render_performance_chart(df):
+    """Build the cumulative P&L figure from trade_performance.csv"""
+    if df.empty:
+        # Return empty figure
+        fig = go.Figure()
+        fig.update_layout(
+            title='No trade performance data available',
+            template='plotly_dark'
+        )
+        return fig
+    
+    # Create a cumulative P&L chart
+    pnl = df['pnl'].to_numpy(dtype=np.float64)
+    prev_pnl = _PERF_CACHE['pnl']
+    prev_running = _PERF_CACHE['running']
+    prev_n = len(prev_pnl)
+    if 0 < prev_n <= len(pnl) and np.array_equal(pnl[:prev_n], prev_pnl, equal_nan=True):
+        # Only new trades were appended
+        running = np.concatenate((prev_running, prev_running[-1] + np.nancumsum(pnl[prev_n:])))
+    else:
+        running = np.nancumsum(pnl)
+    _PERF_CACHE['pnl'] = pnl
+    _PERF_CACHE['running'] = running
+    
+    # Like pandas cumsum, trades without a pnl show as gaps
+    cumulative_pnl = np.where(np.isnan(pnl), np.nan, running)
+    
+    trace = {
+        'type': 'scatter',
+        'x': np.arange(len(cumulative_pnl)),
+        'y': cumulative_pnl,
+        'mode': 'lines',
+        'line': {'color': 'green'}
+    }
+    return {'data': [trace], 'layout': _PERF_LAYOUT}
+
+
 # Callback to update trade history table
 @app.callback(
     Output('trade-history-table-container', 'children'),
-    Input('interval-component', 'n_intervals')
+    Input('state-version', 'data')
 )
-def update_trade_history(n):
+def update_trade_history(version):
     try:
-        if os.path.exists('logs/trade_history.csv'):
-            df = pd.read_csv('logs/trade_history.csv')
-            
-            if not df.empty:
-                # Format columns for display
-                df['entry_time'] = df['entry_time'].fillna('N/A')
-                df['exit_time'] = df['exit_time'].fillna('N/A')
-                df['pnl'] = df['pnl'].apply(lambda x: f"{x:.2f}" if pd.notnull(x) else 'N/A')
-                df['paper_trade'] = df['paper_trade'].apply(lambda x: 'Paper' if x else 'Live')
-                
-                # Create a DataTable
-                table = dash_table.DataTable(
-                    id='trade-table',
-                    columns=[{"name": col.replace('_', ' ').title(), "id": col} for col in df.columns],
-                    data=df.to_dict('records'),
-                    style_header={
-                        'backgroundColor': 'rgb(30, 30, 30)',
-                        'fontWeight': 'bold'
-                    },
-                    style_cell={
-                        'backgroundColor': 'rgb(50, 50, 50)',
-                        'color': 'white',
-                        'textAlign': 'left',
-                        'padding': '8px'
-                    },
-                    style_data_conditional=[
-                        {
-                            'if': {'row_index': 'odd'},
-                            'backgroundColor': 'rgb(40, 40, 40)'
-                        }
-                    ],
-                    page_size=10
-                )
-                return table
-            else:
-                return html.P("No trade history available", className='info-text')
+        if os.path.exists(TRADE_HISTORY_PATH):
+            return _cached_csv_render(TRADE_HISTORY_PATH, _render_trade_history, _TRADE_HISTORY_DTYPES)
         else:
             return html.P("No trade history file found", className='info-text')
     except Exception as e:
@@ -295,37 +492,12 @@ def update_trade_history(n):
 # Callback to update performance chart
 @app.callback(
     Output('trade-performance-chart', 'figure'),
-    Input('interval-component', 'n_intervals')
+    Input('state-version', 'data')
 )
-def update_performance_chart(n):
+def update_performance_chart(version):
     try:
-        if os.path.exists('logs/trade_performance.csv'):
-            df = pd.read_csv('logs/trade_performance.csv')
-            
-            if not df.empty:
-                # Create a cumulative P&L chart
-                df['cumulative_pnl'] = df['pnl'].cumsum()
-                
-                fig = px.line(
-                    df, 
-                    x=df.index, 
-                    y='cumulative_pnl',
-                    title='Cumulative P&L',
-                    labels={'index': 'Trade Number', 'cumulative_pnl': 'Cumulative P&L'}
-                )
-                
-                fig.update_traces(line=dict(color='green'))
-                fig.update_layout(template='plotly_dark')
-                
-                return fig
-            else:
-                # Return empty figure
-                fig = go.Figure()
-                fig.update_layout(
-                    title='No trade performance data available',
-                    template='plotly_dark'
-                )
-                return fig
+        if os.path.exists(TRADE_PERFORMANCE_PATH):
+            return _cached_csv_render(TRADE_PERFORMANCE_PATH, _render_performance_chart)
         else:
             # Return empty figure
             fig = go.Figure()
@@ -345,10 +517,28 @@ def update_performance_chart(n):
         return fig
 
 
+# Fyers client shared by the status checks for up to _CLIENT_TTL seconds
+_CLIENT_TTL = 300
+_client_lock = threading.Lock()
+_client_cache = None  # (created_at, client)
+
+def _get_cached_fyers_client():
+    """get_fyers_client, reusing the last client for _CLIENT_TTL seconds"""
+    global _client_cache
+    with _client_lock:
+        now = time.monotonic()
+        if _client_cache is not None and now - _client_cache[0] < _CLIENT_TTL:
+            return _client_cache[1]
+        client = get_fyers_client()
+        # Only keep a working client so a failed connect is retried next time
+        _client_cache = (now, client) if client else None
+        return client
+
+
 # Callback to update API status
 @app.callback(
     Output('api-status', 'children'),
-    Input('interval-component', 'n_intervals')
+    Input('slow-interval', 'n_intervals')
 )
 def update_api_status(n):
     try:
@@ -364,7 +554,7 @@ def update_api_status(n):
         
         # Check if we can connect to Fyers API
         try:
-            fyers = get_fyers_client()
+            fyers = _get_cached_fyers_client()
             if fyers:
                 api_status = "CONNECTED"
                 api_class = "status-ok"
@@ -393,7 +583,7 @@ def update_api_status(n):
 # Callback to display strategy settings
 @app.callback(
     Output('strategy-settings', 'children'),
-    Input('interval-component', 'n_intervals')
+    Input('slow-interval', 'n_intervals')
 )
 def update_strategy_settings(n):
     try:
@@ -416,23 +606,120 @@ def update_strategy_settings(n):
         return html.P(f"Error loading settings: {str(e)}", className='error-text')
 
 
+# Number of log lines shown and the size of each block read back from the end
+LOG_PATH = os.path.join(src.LOGS_DIR, 'strategy.log')
+LOG_TAIL_LINES = 20
+LOG_TAIL_BLOCK = 8192
+
+def _tail_lines(path, count, end=None):
+    """Return the last count lines of path before offset end (default: end of file),
+    reading backwards in blocks"""
+    with open(path, 'rb') as f:
+        if end is None:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+        pos = end
+        data = b''
+        # One extra newline so the first (possibly partial) line can be dropped
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(LOG_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    if pos > 0:
+        lines = lines[1:]
+    return lines[-count:]
+
+
+# Rolling tail of strategy.log. Only the bytes appended since the last read are
+# read; a watchdog observer (when installed) does this as the file changes so
+# update_logs serves straight from memory.
+_log_lock = threading.Lock()
+_log_tail = deque(maxlen=LOG_TAIL_LINES)
+_log_state = {'ino': None, 'pos': 0, 'version': 0}
+_log_observer = None
+_log_render = (None, None)  # (version, rendered entries)
+
+def _refresh_log_tail():
+    """Pull lines written to strategy.log since the last call into _log_tail"""
+    with _log_lock:
+        st = os.stat(LOG_PATH)
+        if st.st_ino != _log_state['ino'] or st.st_size < _log_state['pos']:
+            # First read, or the log was rotated: start from its last lines
+            _log_tail.clear()
+            _log_tail.extend(_tail_lines(LOG_PATH, LOG_TAIL_LINES, st.st_size))
+            _log_state.update(ino=st.st_ino, pos=st.st_size)
+        elif st.st_size > _log_state['pos']:
+            with open(LOG_PATH, 'rb') as f:
+                f.seek(_log_state['pos'])
+                data = f.read()
+            # Only take complete lines; a line still being written (or a
+            # multibyte character split by the read) is picked up next time
+            end = data.rfind(b'\n') + 1
+            if not end:
+                return
+            data = data[:end]
+            _log_state['pos'] += end
+            _log_tail.extend(data.decode('utf-8', errors='replace').splitlines())
+        else:
+            return
+        _log_state['version'] += 1
+
+
+def _start_log_watcher():
+    """Follow strategy.log with watchdog if it is installed; otherwise update_logs polls"""
+    global _log_observer
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        logging.info("watchdog not installed; polling strategy.log for the log display")
+        return
+    
+    log_file = os.path.abspath(LOG_PATH)
+    
+    class _LogHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if os.path.abspath(event.src_path) == log_file and os.path.exists(log_file):
+                try:
+                    _refresh_log_tail()
+                except Exception as e:
+                    logging.error(f"Error following strategy log: {str(e)}")
+    
+    observer = Observer()
+    observer.schedule(_LogHandler(), os.path.dirname(log_file), recursive=False)
+    observer.daemon = True
+    observer.start()
+    _log_observer = observer
+
+
 # Callback to display system logs
 @app.callback(
     Output('log-display', 'children'),
     Input('interval-component', 'n_intervals')
 )
 def update_logs(n):
+    global _log_render
     try:
         # Read the last few lines of the strategy log
-        log_path = 'logs/strategy.log'
-        if os.path.exists(log_path):
-            with open(log_path, 'r') as file:
-                # Read the last 20 lines
-                lines = file.readlines()[-20:]
-                
-                # Format logs
-                log_entries = [html.P(line.strip(), className='log-entry') for line in lines]
-                return log_entries
+        if os.path.exists(LOG_PATH):
+            # Without a watcher, read whatever was appended since the last tick
+            if _log_observer is None or _log_state['ino'] is None:
+                _refresh_log_tail()
+            
+            with _log_lock:
+                version = _log_state['version']
+                lines = list(_log_tail)
+            
+            # Reuse the last render while the log is untouched
+            if _log_render[0] == version:
+                return _log_render[1]
+            
+            # Format logs
+            log_entries = [html.P(line.strip(), className='log-entry') for line in lines]
+            _log_render = (version, log_entries)
+            return log_entries
         else:
             return html.P("Log file not found", className='error-text')
     except Exception as e:
@@ -440,11 +727,33 @@ def update_logs(n):
         return html.P(f"Error reading logs: {str(e)}", className='error-text')
 
 
+# Reuse option chains fetched within the last _CHAIN_TTL seconds. Within one tick
+# identify_high_oi_strikes fetches each expiry for both the PUT and CALL legs and
+# the OI chart fetches the current expiry again.
+_CHAIN_TTL = 2.0
+_chain_cache = {}  # expiry_index -> (fetched_at, option_chain)
+_original_get_nifty_option_chain = src.nse_data_new.get_nifty_option_chain
+
+def _cached_get_nifty_option_chain(expiry_index=0):
+    """get_nifty_option_chain with a short per-expiry TTL cache"""
+    now = time.monotonic()
+    entry = _chain_cache.get(expiry_index)
+    if entry is not None and now - entry[0] < _CHAIN_TTL:
+        return entry[1]
+    option_chain = _original_get_nifty_option_chain(expiry_index)
+    _chain_cache[expiry_index] = (now, option_chain)
+    return option_chain
+
+# identify_high_oi_strikes imports get_nifty_option_chain from src.nse_data_new on
+# every call, so patching the module attribute routes it through the cache as well
+src.nse_data_new.get_nifty_option_chain = _cached_get_nifty_option_chain
+
+
 # Add a method to OpenInterestStrategy to return the option chain
 def get_option_chain(self):
     """Add this method to the OpenInterestStrategy class to get the current option chain"""
     try:
-        return get_nifty_option_chain()
+        return _cached_get_nifty_option_chain()
     except Exception as e:
         logging.error(f"Error getting option chain: {str(e)}")
         return None
@@ -587,6 +896,7 @@ if __name__ == '__main__':
     # Start the dashboard
     try:
         logging.info("Starting OI Strategy Dashboard...")
+        _start_log_watcher()
         app.run_server(debug=False, host='0.0.0.0', port=8050)
     except Exception as e:
         logging.error(f"Error starting dashboard: {str(e)}")
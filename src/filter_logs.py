@@ -1,8 +1,15 @@
 import re
 import os
+import tempfile
 import logging
 from pathlib import Path
 
+# Sensitive values (client_id, access token head, token combo) in one
+# alternation, compiled once at import, so the log is scanned in a single pass.
+# \s already covers \n, so one value class serves all three keys.
+_SENSITIVE_RE = re.compile(r'(\[DEBUG\] get_fyers_client: client_id=|access_token_head=|token_combo=)[^,\s]+')
+_FILTERED = r'\1***FILTERED***'
+
 def filter_sensitive_log_file(log_file_path):
     """
     Filters sensitive information from a log file
@@ -16,35 +23,20 @@ def filter_sensitive_log_file(log_file_path):
             logging.error(f"Log file not found: {log_file_path}")
             return False
             
-        # Read the original content
-        with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            
-        # Filter sensitive information
-        # Filter client_id
-        filtered_content = re.sub(
-            r'(\[DEBUG\] get_fyers_client: client_id=)[^,\s]+', 
-            r'\1***FILTERED***', 
-            content
-        )
-        
-        # Filter access token
-        filtered_content = re.sub(
-            r'(access_token_head=)[^,\s\n]+', 
-            r'\1***FILTERED***', 
-            filtered_content
+        # Stream the log line by line into a temp file next to it, filtering
+        # sensitive information as it passes, then swap the temp file in
+        tmp = tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', delete=False,
+            dir=os.path.dirname(os.path.abspath(log_file_path))
         )
-        
-        # Filter token combo
-        filtered_content = re.sub(
-            r'(token_combo=)[^,\s\n]+', 
-            r'\1***FILTERED***', 
-            filtered_content
-        )
-        
-        # Write back to the file
-        with open(log_file_path, 'w', encoding='utf-8') as f:
-            f.write(filtered_content)
+        try:
+            with tmp, open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    tmp.write(_SENSITIVE_RE.sub(_FILTERED, line))
+            os.replace(tmp.name, log_file_path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
             
         logging.info(f"Successfully filtered sensitive information from {log_file_path}")
         return True
@@ -1,5 +1,6 @@
 import os
 import re
+import mmap
 import sys
 import logging
 from pathlib import Path
@@ -13,55 +14,68 @@ logging.basicConfig(
     ]
 )
 
+# Patterns that hint at token logging in source files
+TOKEN_PATTERNS = [
+    r"logging\.(?:debug|info|warning|error|critical).*token",
+    r"logging\.(?:debug|info|warning|error|critical).*client_id",
+    r"\[DEBUG\]",
+    r"DEBUG.*token",
+    r"debug.*token"
+]
+# Compiled as bytes patterns so they run directly over the mmapped source files
+_TOKEN_RES = [(pattern, re.compile(pattern.encode(), re.IGNORECASE)) for pattern in TOKEN_PATTERNS]
+# All of them in one alternation: a file that does not match it can skip the
+# per-pattern checks, which are only needed to report which patterns matched
+_ANY_TOKEN_RE = re.compile(b'|'.join(b'(?:' + pattern.encode() + b')' for pattern in TOKEN_PATTERNS), re.IGNORECASE)
+
 def find_debug_log_sources():
     """Find all sources that might be adding debug logs with token information"""
     # Get the source directory
     src_dir = Path(__file__).parent / 'src'
     
-    # Find files with potential token logging
-    token_patterns = [
-        r"logging\.(?:debug|info|warning|error|critical).*token",
-        r"logging\.(?:debug|info|warning|error|critical).*client_id",
-        r"\[DEBUG\]",
-        r"DEBUG.*token",
-        r"debug.*token"
-    ]
-    
+    # Read each file once and check it for token logging and logging monkey patching
     suspicious_files = []
-    for pattern in token_patterns:
-        for python_file in src_dir.rglob("*.py"):
-            with open(python_file, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
-                if re.search(pattern, content, re.IGNORECASE):
-                    suspicious_files.append((python_file, pattern))
-                    logging.info(f"Found potential token logging in {python_file} matching pattern: {pattern}")
-
-    # Check for monkey patching of the logging module
     for python_file in src_dir.rglob("*.py"):
-        with open(python_file, 'r', encoding='utf-8', errors='ignore') as file:
-            content = file.read()
-            if "logging.orig_" in content or "orig_logging" in content or "patch" in content and "logging" in content:
+        # mmap cannot map an empty file, and there is nothing to check in one anyway
+        if os.path.getsize(python_file) == 0:
+            continue
+        
+        # Scan the raw bytes through mmap instead of decoding each file into a str
+        with open(python_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            # Find files with potential token logging
+            if _ANY_TOKEN_RE.search(content):
+                for pattern, regex in _TOKEN_RES:
+                    if regex.search(content):
+                        suspicious_files.append((python_file, pattern))
+                        logging.info(f"Found potential token logging in {python_file} matching pattern: {pattern}")
+            
+            # Check for monkey patching of the logging module (mmap's `in` only
+            # tests single bytes, so substrings are looked up with find)
+            if (content.find(b"logging.orig_") != -1 or content.find(b"orig_logging") != -1
+                    or (content.find(b"patch") != -1 and content.find(b"logging") != -1)):
                 suspicious_files.append((python_file, "Potential logging monkey patching"))
                 logging.info(f"Found potential logging modification in {python_file}")
 
     return suspicious_files
 
+# Both token debug patterns in one alternation; every match contains "token",
+# which lets most lines be rejected with a substring check before the regex
+_TOK_RE = re.compile(rb"\[DEBUG\].*(?:client_id=.*token|access_token)", re.IGNORECASE)
+
 def check_strategy_log_debug_entries():
     """Check strategy.log for debug entries related to tokens"""
     log_file = Path(__file__).parent / 'logs' / 'strategy.log'
-    token_patterns = [
-        r"\[DEBUG\].*client_id=.*token",
-        r"\[DEBUG\].*access_token"
-    ]
     
     found_entries = []
     if log_file.exists():
-        with open(log_file, 'r', encoding='utf-8', errors='ignore') as file:
-            for i, line in enumerate(file):
-                for pattern in token_patterns:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        found_entries.append((i+1, line.strip()))
-                        logging.info(f"Found token debug entry at line {i+1}: {line.strip()}")
+        with open(log_file, 'rb') as file:
+            for i, line in enumerate(file, 1):
+                if b'token' not in line.lower():
+                    continue
+                if _TOK_RE.search(line):
+                    entry = line.strip().decode('utf-8', errors='ignore')
+                    found_entries.append((i, entry))
+                    logging.info(f"Found token debug entry at line {i}: {entry}")
                         
     return found_entries
 
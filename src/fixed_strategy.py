@@ -1,14 +1,12 @@
-import pandas as pd
 import datetime
 import time
 import logging
-import schedule
-import json
-import os
-import pytz
-import threading
+import logging.handlers
+import atexit
 import queue
-import re
+import os
+import shutil
+import functools
 from datetime import date
 from src.fyers_api_utils import (
     get_fyers_client, place_market_order, modify_order, exit_position,
@@ -17,17 +15,59 @@ from src.fyers_api_utils import (
 )
 from src.nse_data_new import get_nifty_option_chain
 from src.config import load_config
-from src.token_helper import ensure_valid_token
+from src.token_helper import ensure_valid_token, is_token_valid
+from src import LOGS_DIR
 
-# Ensure logs directory exists
-os.makedirs('logs', exist_ok=True)
+# Setup logging. Like basicConfig, this only applies when the root logger has
+# no handlers yet. The calling thread only enqueues records; a background
+# listener does the file writes, so logging on the tick path never touches disk
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(LOGS_DIR, 'strategy.log'),
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5
+    )
+    _file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    _log_queue = queue.Queue(-1)
+    _root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _root_logger.setLevel(logging.INFO)
+    _log_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
+    _log_listener.start()
+    # Drain queued records into the file before the interpreter exits
+    atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
 
-# Setup logging
-logging.basicConfig(
-    filename='logs/strategy.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# How long a successful self-diagnostic check is reused before it is re-run
+DIAGNOSTIC_CACHE_SECONDS = 30
+
+def _ttl_cache(seconds, valid=bool):
+    """Reuse a function's last valid result for `seconds` (failures are always re-checked)"""
+    def decorator(func):
+        last = [None, None]  # [timestamp, value]
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if last[0] is not None and now - last[0] < seconds:
+                return last[1]
+            value = func()
+            if valid(value):
+                last[0], last[1] = now, value
+            return value
+        return wrapper
+    return decorator
+
+@_ttl_cache(DIAGNOSTIC_CACHE_SECONDS)
+def _check_token():
+    return is_token_valid()
+
+@_ttl_cache(DIAGNOSTIC_CACHE_SECONDS, valid=lambda price: bool(price and price > 0))
+def _check_spot():
+    return get_nifty_spot_price()
+
+@_ttl_cache(DIAGNOSTIC_CACHE_SECONDS, valid=lambda chain: chain is not None and not chain.empty)
+def _check_option_chain():
+    return get_nifty_option_chain()
 
 class FixedOpenInterestStrategy:
     """Fixed version of the OpenInterestStrategy class with all required methods"""
@@ -36,6 +76,10 @@ class FixedOpenInterestStrategy:
         self.config = load_config()
         self.fyers = get_fyers_client()
         self.active_trade = None
+        self.live_prices = {}
+        self.market_closed = False
+        # Trade for which the market-closed warning was last logged
+        self._market_closed_logged_trade = None
         self.highest_put_oi_strike = None
         self.highest_call_oi_strike = None
         self.put_premium_at_9_20 = None
@@ -45,7 +89,9 @@ class FixedOpenInterestStrategy:
         self.stop_loss_order_id = None
         self.target_order_id = None
         self.data_socket = None
-        self.trade_history = []
+        # Trade history is read from trade_history.csv on first access
+        self._trade_history_path = os.path.join(LOGS_DIR, 'trade_history.csv')
+        self._trade_history = None
         self.trade_taken_today = False  # Flag to track if a trade has been taken today
         # Ensure breakout levels are always defined
         self.put_breakout_level = None
@@ -55,26 +101,24 @@ class FixedOpenInterestStrategy:
         self.put_expiry_idx = None
         self.call_expiry_idx = None
         
+        # Strategy settings are read once here (load_config itself is cached) and
+        # coerced to their types, so later code uses plain attributes
+        strat = self.config.get('strategy') or {}
         # Paper trading mode (simulate trades without placing actual orders)
-        self.paper_trading = self.config.get('strategy', {}).get('paper_trading', True)
+        self.paper_trading = bool(strat.get('paper_trading', True))
         # Minimum premium threshold to avoid triggering trades on tiny values
-        self.min_premium_threshold = self.config.get('strategy', {}).get('min_premium_threshold', 50.0)
+        self.min_premium_threshold = float(strat.get('min_premium_threshold', 50.0))
         # Maximum allowed deviation from ATM in absolute points for strike selection
-        self.max_strike_distance = self.config.get('strategy', {}).get('max_strike_distance', 500)
+        self.max_strike_distance = float(strat.get('max_strike_distance', 500))
         
-        # Load existing trade history if available
+        # Check for today's Excel file
+        today = date.today().strftime("%Y%m%d")
+        excel_path = os.path.join(LOGS_DIR, f'trade_history_{today}.xlsx')
         try:
-            if os.path.exists('logs/trade_history.csv'):
-                self.trade_history = pd.read_csv('logs/trade_history.csv').to_dict('records')
-                logging.info(f"Loaded {len(self.trade_history)} historical trades from CSV")
-                
-                # Check for today's Excel file
-                today = date.today().strftime("%Y%m%d")
-                excel_path = f'logs/trade_history_{today}.xlsx'
-                if os.path.exists(excel_path) and os.path.getsize(excel_path) > 0:
-                    logging.info(f"Excel trade history file {excel_path} exists")
-        except Exception as e:
-            logging.warning(f"Could not load trade history: {str(e)}")
+            if os.stat(excel_path).st_size > 0:
+                logging.info(f"Excel trade history file {excel_path} exists")
+        except OSError:
+            pass
         
         # Initialize additional variables for tracking unrealized profit/loss
         self.max_unrealized_profit = 0
@@ -82,19 +126,42 @@ class FixedOpenInterestStrategy:
         self.max_unrealized_loss = 0
         self.max_unrealized_loss_pct = 0
     
+    @property
+    def trade_history(self):
+        """Historical trades from trade_history.csv, loaded on first access"""
+        if self._trade_history is None:
+            self._trade_history = []
+            try:
+                if os.path.exists(self._trade_history_path):
+                    # pandas is only needed here, so it is not imported with the module
+                    import pandas as pd
+                    self._trade_history = pd.read_csv(self._trade_history_path).to_dict('records')
+                    logging.info(f"Loaded {len(self._trade_history)} historical trades from CSV")
+            except Exception as e:
+                logging.warning(f"Could not load trade history: {str(e)}")
+        return self._trade_history
+    
+    @trade_history.setter
+    def trade_history(self, value):
+        self._trade_history = value
+    
     def clear_logs(self):
         """Clear log file for a fresh start to the trading day"""
         try:
-            log_file = 'logs/strategy.log'
-            if os.path.exists(log_file):
+            log_file = os.path.join(LOGS_DIR, 'strategy.log')
+            # One stat for both the existence and the size check
+            try:
+                log_size = os.stat(log_file).st_size
+            except FileNotFoundError:
+                log_size = None
+            if log_size is not None:
                 # Keep existing logs by backing up current log file
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = f'logs/strategy_{timestamp}.log.bak'
+                backup_file = os.path.join(LOGS_DIR, f'strategy_{timestamp}.log.bak')
                 
                 # Copy to backup before clearing
-                if os.path.getsize(log_file) > 0:
-                    with open(log_file, 'r') as src, open(backup_file, 'w') as dst:
-                        dst.write(src.read())
+                if log_size > 0:
+                    shutil.copyfile(log_file, backup_file)
                     logging.info(f"Log file backed up to {backup_file}")
                     
                 # Clear the current log file
@@ -114,8 +181,7 @@ class FixedOpenInterestStrategy:
         
         # Check 1: Test authentication
         try:
-            from src.token_helper import is_token_valid
-            token_valid = is_token_valid()
+            token_valid = _check_token()
             if token_valid:
                 logging.info("✓ Authentication token is valid")
             else:
@@ -127,8 +193,7 @@ class FixedOpenInterestStrategy:
             
         # Check 2: Test API connectivity
         try:
-            from src.fyers_api_utils import get_nifty_spot_price
-            spot_price = get_nifty_spot_price()
+            spot_price = _check_spot()
             if spot_price and spot_price > 0:
                 logging.info(f"✓ API connectivity verified - Nifty spot price: {spot_price}")
             else:
@@ -140,8 +205,7 @@ class FixedOpenInterestStrategy:
             
         # Check 3: Test option chain retrieval 
         try:
-            from src.nse_data_new import get_nifty_option_chain
-            option_chain = get_nifty_option_chain()
+            option_chain = _check_option_chain()
             if option_chain is not None and not option_chain.empty:
                 logging.info(f"✓ Option chain retrieval verified - Got {len(option_chain)} options")
             else:
@@ -151,14 +215,15 @@ class FixedOpenInterestStrategy:
             logging.error(f"✗ Option chain retrieval check failed: {str(e)}")
             diagnostics_passed = False
             
-        # Check 4: Test Excel file access
+        # Check 4: Test Excel file access (a plain create/write/remove probe of
+        # the logs directory; building a real workbook is not needed for that)
         try:
-            import pandas as pd
-            test_df = pd.DataFrame([{"test": "data"}])
-            test_path = "logs/diagnostic_test.xlsx"
-            with pd.ExcelWriter(test_path, engine='openpyxl') as writer:
-                test_df.to_excel(writer, index=False)
-            import os
+            test_path = os.path.join(LOGS_DIR, "diagnostic_test.xlsx")
+            fd = os.open(test_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, b"probe")
+            finally:
+                os.close(fd)
             os.remove(test_path)
             logging.info("✓ Excel file writing and access verified")
         except Exception as e:
@@ -179,15 +244,14 @@ class FixedOpenInterestStrategy:
             # Clear the logs for a fresh start
             self.clear_logs()
             
-            # Reset all state variables for a clean start
-            self.reset_state()
-            
             access_token = ensure_valid_token()
             if access_token:
                 self.fyers = get_fyers_client(check_token=False)  # Token already checked
                 logging.info("Authentication verified for today's trading session")
             else:
                 logging.error("Failed to obtain valid access token for today's session")
+                # Don't carry the previous day's state over when bailing out early
+                self.reset_state()
                 return False
                 
             # Close any existing websocket connection
@@ -231,6 +295,7 @@ class FixedOpenInterestStrategy:
         
         # Initialize trade state variables
         self.active_trade = None
+        self._market_closed_logged_trade = None
         self.entry_time = None
         self.order_id = None
         self.stop_loss_order_id = None
@@ -269,49 +334,55 @@ class FixedOpenInterestStrategy:
     
     def quick_exit_check(self):
         """Check for immediate exit conditions (SL/target) on every monitoring loop iteration"""
-        if not self.active_trade:
+        # Runs on every monitoring tick, so the trade dict is bound to a local once
+        trade = self.active_trade
+        if not trade:
             return
         
-        try:
-            symbol = self.active_trade['symbol']
-            current_price = self.live_prices.get(symbol) or self.active_trade.get('last_known_price')
-            if not current_price:
-                return
-                
-            # Store the last known price in the active trade
-            self.active_trade['last_known_price'] = current_price
-            
-            # Check if we have a market_closed flag in the active trade
-            market_closed = self.active_trade.get('market_closed', getattr(self, 'market_closed', False))
-            
-            # If market is closed, we should skip exit check to avoid false triggers
-            if market_closed:
-                if not hasattr(self, '_market_closed_exit_logged'):
-                    logging.warning(f"Market is closed - skipping exit checks for {symbol}")
-                    self._market_closed_exit_logged = True
-                return
-                
-            stop_loss = self.active_trade.get('stoploss')
-            target = self.active_trade.get('target')
+        # Explicit checks instead of a try around the whole tick; only the exit
+        # order below can fail in ways that need catching
+        symbol = trade.get('symbol')
+        current_price = self.live_prices.get(symbol) or trade.get('last_known_price')
+        if not symbol or not current_price:
+            return
             
-            exit_type = None
-            if current_price <= stop_loss:
-                exit_type = "STOPLOSS"
-                logging.info(f"QUICK_CHECK: STOPLOSS HIT at {current_price:.2f} (<= {stop_loss:.2f})")
-            elif current_price >= target:
-                exit_type = "TARGET"
-                logging.info(f"QUICK_CHECK: TARGET HIT at {current_price:.2f} (>= {target:.2f})")
+        # Store the last known price in the active trade
+        trade['last_known_price'] = current_price
+        
+        # Check if we have a market_closed flag in the active trade
+        market_closed = trade.get('market_closed', self.market_closed)
+        
+        # If market is closed, we should skip exit check to avoid false triggers
+        if market_closed:
+            # Warn once per trade
+            if self._market_closed_logged_trade is not trade:
+                logger.warning("Market is closed - skipping exit checks for %s", symbol)
+                self._market_closed_logged_trade = trade
+            return
             
-            if exit_type:
-                quantity = self.active_trade['quantity']
-                is_paper_trade = self.active_trade.get('paper_trade', self.paper_trading)
+        stop_loss = trade.get('stoploss')
+        target = trade.get('target')
+        if stop_loss is None or target is None:
+            return
+        
+        exit_type = None
+        if current_price <= stop_loss:
+            exit_type = "STOPLOSS"
+            logger.info("QUICK_CHECK: STOPLOSS HIT at %.2f (<= %.2f)", current_price, stop_loss)
+        elif current_price >= target:
+            exit_type = "TARGET"
+            logger.info("QUICK_CHECK: TARGET HIT at %.2f (>= %.2f)", current_price, target)
+        
+        if exit_type:
+            try:
+                quantity = trade['quantity']
+                is_paper_trade = trade.get('paper_trade', self.paper_trading)
                 
                 if is_paper_trade:
                     exit_response = {'s': 'ok', 'id': f'PAPER-EXIT-{int(time.time())}'}
                 else:
-                    from src.fyers_api_utils import exit_position
                     exit_response = exit_position(self.fyers, symbol, quantity, "SELL")
                 
                 self.process_exit(exit_type, current_price, exit_response)
-        except Exception as e:
-            logging.error(f"Error in quick exit check: {str(e)}")
+            except Exception as e:
+                logger.error("Error in quick exit check: %s", e)
@@ -1,14 +1,13 @@
-import pandas as pd
 import datetime
 import time
 import logging
-import schedule
-import json
+import logging.handlers
+import atexit
+import queue
 import os
+import shutil
 import pytz
-import threading
-import queue
-import re
+import functools
 from datetime import date
 from src.fyers_api_utils import (
     get_fyers_client, place_market_order, modify_order, exit_position,
@@ -17,17 +16,61 @@ from src.fyers_api_utils import (
 )
 from src.nse_data_new import get_nifty_option_chain
 from src.config import load_config
-from src.token_helper import ensure_valid_token
+from src.token_helper import ensure_valid_token, is_token_valid
+from src import LOGS_DIR
 
-# Ensure logs directory exists
-os.makedirs('logs', exist_ok=True)
+# Setup logging. Like basicConfig, this only applies when the root logger has
+# no handlers yet. The calling thread only enqueues records; a background
+# listener does the file writes, so logging on the tick path never touches disk
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(LOGS_DIR, 'strategy.log'),
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5
+    )
+    _file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    _log_queue = queue.Queue(-1)
+    _root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _root_logger.setLevel(logging.INFO)
+    _log_listener = logging.handlers.QueueListener(_log_queue, _file_handler)
+    _log_listener.start()
+    # Drain queued records into the file before the interpreter exits
+    atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
 
-# Setup logging
-logging.basicConfig(
-    filename='logs/strategy.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+IST = pytz.timezone('Asia/Kolkata')
+
+# How long a successful self-diagnostic check is reused before it is re-run
+DIAGNOSTIC_CACHE_SECONDS = 30
+
+def _ttl_cache(seconds, valid=bool):
+    """Reuse a function's last valid result for `seconds` (failures are always re-checked)"""
+    def decorator(func):
+        last = [None, None]  # [timestamp, value]
+        @functools.wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if last[0] is not None and now - last[0] < seconds:
+                return last[1]
+            value = func()
+            if valid(value):
+                last[0], last[1] = now, value
+            return value
+        return wrapper
+    return decorator
+
+@_ttl_cache(DIAGNOSTIC_CACHE_SECONDS)
+def _check_token():
+    return is_token_valid()
+
+@_ttl_cache(DIAGNOSTIC_CACHE_SECONDS, valid=lambda price: bool(price and price > 0))
+def _check_spot():
+    return get_nifty_spot_price()
+
+@_ttl_cache(DIAGNOSTIC_CACHE_SECONDS, valid=lambda chain: chain is not None and not chain.empty)
+def _check_option_chain():
+    return get_nifty_option_chain()
 
 class FixedOpenInterestStrategy:
     """Fixed version of the OpenInterestStrategy class with all required methods"""
@@ -45,7 +88,9 @@ class FixedOpenInterestStrategy:
         self.stop_loss_order_id = None
         self.target_order_id = None
         self.data_socket = None
-        self.trade_history = []
+        # Trade history is read from trade_history.csv on first access
+        self._trade_history_path = os.path.join(LOGS_DIR, 'trade_history.csv')
+        self._trade_history = None
         self.trade_taken_today = False  # Flag to track if a trade has been taken today
         # Ensure breakout levels are always defined
         self.put_breakout_level = None
@@ -55,26 +100,26 @@ class FixedOpenInterestStrategy:
         self.put_expiry_idx = None
         self.call_expiry_idx = None
         
+        # Strategy settings are read once here (load_config itself is cached) and
+        # coerced to their types, so later code uses plain attributes
+        strat = self.config.get('strategy') or {}
         # Paper trading mode (simulate trades without placing actual orders)
-        self.paper_trading = self.config.get('strategy', {}).get('paper_trading', True)
+        self.paper_trading = bool(strat.get('paper_trading', True))
         # Minimum premium threshold to avoid triggering trades on tiny values
-        self.min_premium_threshold = self.config.get('strategy', {}).get('min_premium_threshold', 50.0)
+        self.min_premium_threshold = float(strat.get('min_premium_threshold', 50.0))
         # Maximum allowed deviation from ATM in absolute points for strike selection
-        self.max_strike_distance = self.config.get('strategy', {}).get('max_strike_distance', 500)
+        self.max_strike_distance = float(strat.get('max_strike_distance', 500))
+        # Trailing stop percentage and the price multiplier derived from it
+        self._load_trailing_config()
         
-        # Load existing trade history if available
+        # Check for today's Excel file
+        today = date.today().strftime("%Y%m%d")
+        excel_path = os.path.join(LOGS_DIR, f'trade_history_{today}.xlsx')
         try:
-            if os.path.exists('logs/trade_history.csv'):
-                self.trade_history = pd.read_csv('logs/trade_history.csv').to_dict('records')
-                logging.info(f"Loaded {len(self.trade_history)} historical trades from CSV")
-                
-                # Check for today's Excel file
-                today = date.today().strftime("%Y%m%d")
-                excel_path = f'logs/trade_history_{today}.xlsx'
-                if os.path.exists(excel_path) and os.path.getsize(excel_path) > 0:
-                    logging.info(f"Excel trade history file {excel_path} exists")
-        except Exception as e:
-            logging.warning(f"Could not load trade history: {str(e)}")
+            if os.stat(excel_path).st_size > 0:
+                logging.info(f"Excel trade history file {excel_path} exists")
+        except OSError:
+            pass
         
         # Initialize additional variables for tracking unrealized profit/loss
         self.max_unrealized_profit = 0
@@ -82,59 +127,74 @@ class FixedOpenInterestStrategy:
         self.max_unrealized_loss = 0
         self.max_unrealized_loss_pct = 0
     
+    def _load_trailing_config(self):
+        """Cache the trailing stop percentage from config and its price multiplier"""
+        strat = (self.config or {}).get('strategy') or {}
+        self._trail_pct = float(strat.get('trailing_stop_pct', 8))
+        self._trail_mult = 1 - (self._trail_pct / 100)
+    
     def update_trailing_stoploss(self, current_price):
         """Update the trailing stoploss based on current price and profit percentage"""
-        if not self.active_trade:
+        trade = self.active_trade
+        if not trade:
             return False
         
-        symbol = self.active_trade.get('symbol', '')
-        entry_price = self.active_trade.get('entry_price', 0)
-        current_sl = self.active_trade.get('stoploss', 0)
-        original_stoploss = self.active_trade.get('original_stoploss', current_sl)
-        
+        current_sl = trade.get('stoploss', 0)
         # First time trailing SL is called, store the original stoploss
-        if 'original_stoploss' not in self.active_trade:
-            self.active_trade['original_stoploss'] = current_sl
-            original_stoploss = current_sl
-        
-        # Get trailing stop percentage from config
-        config = self.config or {}
-        trailing_stop_pct = config.get('strategy', {}).get('trailing_stop_pct', 8)
+        original_stoploss = trade.setdefault('original_stoploss', current_sl)
         
         # Calculate new potential stoploss (current price - trailing percentage)
-        potential_stoploss = current_price * (1 - (trailing_stop_pct / 100))
-        
-        # Log debug info
-        logging.info(f"TRAILING SL DEBUG | symbol: {symbol} | entry_price: {entry_price} | current_price: {current_price} | trailing_stop_pct: {trailing_stop_pct} | current_sl: {current_sl} | original_stoploss: {original_stoploss}")
+        potential_stoploss = current_price * self._trail_mult
         
-        # For long positions, we want to move the stoploss up as price increases
-        logging.info(f"TRAILING SL DEBUG | [LONG] potential_stoploss: {potential_stoploss}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"TRAILING SL DEBUG | symbol: {trade.get('symbol', '')} | entry_price: {trade.get('entry_price', 0)} | current_price: {current_price} | trailing_stop_pct: {self._trail_pct} | current_sl: {current_sl} | original_stoploss: {original_stoploss} | [LONG] potential_stoploss: {potential_stoploss}")
         
-        # Only update if the new stoploss is higher than both current stoploss and original stoploss
+        # For long positions, move the stoploss up only if the new stoploss is
+        # higher than both current stoploss and original stoploss
         if potential_stoploss > current_sl and potential_stoploss > original_stoploss:
-            old_sl = self.active_trade['stoploss']
-            self.active_trade['stoploss'] = round(potential_stoploss, 3)
-            self.active_trade['trailing_stoploss'] = round(potential_stoploss, 3)
+            trade['stoploss'] = round(potential_stoploss, 3)
+            trade['trailing_stoploss'] = trade['stoploss']
             
-            logging.info(f"Trailing stoploss updated from {old_sl} to {self.active_trade['stoploss']}")
+            logging.info(f"Trailing stoploss updated from {current_sl} to {trade['stoploss']}")
             return True
-        else:
-            logging.info(f"TRAILING SL DEBUG | [LONG] No update: potential_stoploss ({potential_stoploss}) <= current_sl ({current_sl}) or original_stoploss ({original_stoploss})")
-            return False
+        return False
+    
+    @property
+    def trade_history(self):
+        """Historical trades from trade_history.csv, loaded on first access"""
+        if self._trade_history is None:
+            self._trade_history = []
+            try:
+                if os.path.exists(self._trade_history_path):
+                    # pandas is only needed here, so it is not imported with the module
+                    import pandas as pd
+                    self._trade_history = pd.read_csv(self._trade_history_path).to_dict('records')
+                    logging.info(f"Loaded {len(self._trade_history)} historical trades from CSV")
+            except Exception as e:
+                logging.warning(f"Could not load trade history: {str(e)}")
+        return self._trade_history
+    
+    @trade_history.setter
+    def trade_history(self, value):
+        self._trade_history = value
     
     def clear_logs(self):
         """Clear log file for a fresh start to the trading day"""
         try:
-            log_file = 'logs/strategy.log'
-            if os.path.exists(log_file):
+            log_file = os.path.join(LOGS_DIR, 'strategy.log')
+            # One stat for both the existence and the size check
+            try:
+                log_size = os.stat(log_file).st_size
+            except FileNotFoundError:
+                log_size = None
+            if log_size is not None:
                 # Keep existing logs by backing up current log file
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = f'logs/strategy_{timestamp}.log.bak'
+                backup_file = os.path.join(LOGS_DIR, f'strategy_{timestamp}.log.bak')
                 
                 # Copy to backup before clearing
-                if os.path.getsize(log_file) > 0:
-                    with open(log_file, 'r') as src, open(backup_file, 'w') as dst:
-                        dst.write(src.read())
+                if log_size > 0:
+                    shutil.copyfile(log_file, backup_file)
                     logging.info(f"Log file backed up to {backup_file}")
                     
                 # Clear the current log file
@@ -154,8 +214,7 @@ class FixedOpenInterestStrategy:
         
         # Check 1: Test authentication
         try:
-            from src.token_helper import is_token_valid
-            token_valid = is_token_valid()
+            token_valid = _check_token()
             if token_valid:
                 logging.info("✓ Authentication token is valid")
             else:
@@ -167,8 +226,7 @@ class FixedOpenInterestStrategy:
             
         # Check 2: Test API connectivity
         try:
-            from src.fyers_api_utils import get_nifty_spot_price
-            spot_price = get_nifty_spot_price()
+            spot_price = _check_spot()
             if spot_price and spot_price > 0:
                 logging.info(f"✓ API connectivity verified - Nifty spot price: {spot_price}")
             else:
@@ -180,8 +238,7 @@ class FixedOpenInterestStrategy:
             
         # Check 3: Test option chain retrieval 
         try:
-            from src.nse_data_new import get_nifty_option_chain
-            option_chain = get_nifty_option_chain()
+            option_chain = _check_option_chain()
             if option_chain is not None and not option_chain.empty:
                 logging.info(f"✓ Option chain retrieval verified - Got {len(option_chain)} options")
             else:
@@ -191,14 +248,15 @@ class FixedOpenInterestStrategy:
             logging.error(f"✗ Option chain retrieval check failed: {str(e)}")
             diagnostics_passed = False
             
-        # Check 4: Test Excel file access
+        # Check 4: Test Excel file access (a plain create/write/remove probe of
+        # the logs directory; building a real workbook is not needed for that)
         try:
-            import pandas as pd
-            test_df = pd.DataFrame([{"test": "data"}])
-            test_path = "logs/diagnostic_test.xlsx"
-            with pd.ExcelWriter(test_path, engine='openpyxl') as writer:
-                test_df.to_excel(writer, index=False)
-            import os
+            test_path = os.path.join(LOGS_DIR, "diagnostic_test.xlsx")
+            fd = os.open(test_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, b"probe")
+            finally:
+                os.close(fd)
             os.remove(test_path)
             logging.info("✓ Excel file writing and access verified")
         except Exception as e:
@@ -219,15 +277,14 @@ class FixedOpenInterestStrategy:
             # Clear the logs for a fresh start
             self.clear_logs()
             
-            # Reset all state variables for a clean start
-            self.reset_state()
-            
             access_token = ensure_valid_token()
             if access_token:
                 self.fyers = get_fyers_client(check_token=False)  # Token already checked
                 logging.info("Authentication verified for today's trading session")
             else:
                 logging.error("Failed to obtain valid access token for today's session")
+                # Don't carry the previous day's state over when bailing out early
+                self.reset_state()
                 return False
                 
             # Close any existing websocket connection
@@ -257,6 +314,8 @@ class FixedOpenInterestStrategy:
     
     def reset_state(self):
         """Reset all state variables for a clean start"""
+        self._load_trailing_config()
+        
         # OI analysis results
         self.highest_put_oi_strike = None
         self.highest_call_oi_strike = None
@@ -333,9 +392,8 @@ class FixedOpenInterestStrategy:
             return {"success": True, "message": "Strategy run completed", "trade_taken": bool(self.active_trade)}
         
         except Exception as e:
-            logging.error(f"Error in run_strategy: {str(e)}")
-            import traceback
-            logging.error(traceback.format_exc())
+            # exc_info lets the handler format the traceback into the same record
+            logging.exception("Error in run_strategy: %s", e)
             return {"success": False, "message": f"Error in strategy: {str(e)}"}
     
     def cleanup(self):
@@ -354,31 +412,24 @@ class FixedOpenInterestStrategy:
     
     def get_ist_datetime(self):
         """Get current time in IST timezone"""
-        ist_tz = pytz.timezone('Asia/Kolkata')
-        ist_now = datetime.datetime.now(ist_tz)
-        return ist_now
+        return datetime.datetime.now(IST)
     
     def wait_for_market_open(self):
         """Wait for market to open and then run the strategy"""
         logging.info("Waiting for market to open...")
         
+        # IST has no DST, so replacing the clock fields on the aware time is safe
         ist_now = self.get_ist_datetime()
-        market_open_time = datetime.time(9, 15)
-        current_time = ist_now.time()
+        market_open = ist_now.replace(hour=9, minute=15, second=0, microsecond=0)
+        time_to_wait = (market_open - ist_now).total_seconds()
         
-        if current_time < market_open_time:
-            time_to_wait = (
-                datetime.datetime.combine(datetime.date.today(), market_open_time) - 
-                datetime.datetime.combine(datetime.date.today(), current_time)
-            ).seconds
+        if time_to_wait > 0:
+            logging.info(f"Market opens in {int(time_to_wait)} seconds. Waiting...")
             
-            logging.info(f"Market opens in {time_to_wait} seconds. Waiting...")
-            
-            # Wait for market to open
+            # Wait for market to open in a single sleep
             time.sleep(time_to_wait + 5)  # Add 5 seconds buffer
-            
-            # Run strategy once market is open
-            return self.run_strategy(force_analysis=True)
         else:
             logging.info("Market is already open")
-            return self.run_strategy(force_analysis=True)
+        
+        # Run strategy once market is open
+        return self.run_strategy(force_analysis=True)
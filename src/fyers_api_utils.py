@@ -470,9 +470,7 @@ def robust_market_data_websocket(symbols, callback_handler=None, data_type="Symb
                 if callable(on_success):
                     on_success({"status": "Subscription requested but unconfirmed", "symbols": valid_symbols})
         except Exception as e:
-            logging.error(f"Error subscribing to symbols: {str(e)}")
-            import traceback
-            logging.error(f"Subscription error traceback: {traceback.format_exc()}")
+            logging.exception("Error subscribing to symbols: %s", e)
             if callable(on_failure):
                 on_failure("ERROR", str(e))
 
@@ -620,9 +618,7 @@ def start_market_data_websocket(symbols, callback_handler=None, data_type="Symbo
         
         return ws_client
     except Exception as e:
-        logging.error(f"Error starting market data websocket: {str(e)}")
-        import traceback
-        logging.error(f"Traceback: {traceback.format_exc()}")
+        logging.exception("Error starting market data websocket: %s", e)
         return None
 
 def get_nifty_spot_price():
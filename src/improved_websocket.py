@@ -10,7 +10,6 @@ import pandas as pd
 import threading
 import queue
 import random
-import traceback
 from src.config import load_config
 from src.token_helper import ensure_valid_token
 
@@ -99,8 +98,8 @@ def improved_market_data_websocket(symbols, callback_handler=None, data_type="Sy
             try:
                 callback_handler(symbol, 'tick', ws_ticks, ws_ticks)
             except Exception as e:
-                logging.error(f"Error in callback handler: {e}")
-                logging.debug(f"Callback error details: {traceback.format_exc()}")
+                logging.error("Error in callback handler: %s", e)
+                logging.debug("Callback error details", exc_info=True)
         
         # Log diagnostic information
         if connection_status['tick_count'] % 50 == 0 and not connection_status['status_logged']:
@@ -220,8 +219,7 @@ def improved_market_data_websocket(symbols, callback_handler=None, data_type="Sy
             return None
             
     except Exception as e:
-        logging.error(f"Error creating websocket client: {e}")
-        logging.error(traceback.format_exc())
+        logging.exception("Error creating websocket client: %s", e)
         return None
 
 def enhanced_start_market_data_websocket(symbols, callback_handler=None):
@@ -14,13 +14,11 @@ from src.strategy import OpenInterestStrategy
 from src.config import load_config
 from src.token_helper import ensure_valid_token
 from src.auth import generate_access_token
-
-# Ensure logs directory exists
-os.makedirs('logs', exist_ok=True)
+from src import LOGS_DIR
 
 # Setup logging
 logging.basicConfig(
-    filename='logs/strategy.log',
+    filename=os.path.join(LOGS_DIR, 'strategy.log'),
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
@@ -4,6 +4,13 @@ import logging
 import datetime
 import time
 from io import StringIO
+
+# orjson parses the large NSE option chain payload several times faster when
+# it is installed; the stdlib parser takes the same bytes otherwise
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 from src.fyers_api_utils import get_fyers_client, get_nifty_spot_price
 
 
@@ -233,18 +240,19 @@ def _get_nifty_option_chain_fallback():
         if response.status_code == 200:
             try:
                 # Check for invalid content before trying to parse JSON
-                content_preview = response.text[:50].strip()
-                if not content_preview.startswith('{'):
-                    logging.error(f"Invalid JSON response from NSE API, doesn't start with '{{': {content_preview}...")
+                # (checked on the raw bytes so the body is not decoded to str first)
+                content_preview = response.content[:50].strip()
+                if not content_preview.startswith(b'{'):
+                    logging.error(f"Invalid JSON response from NSE API, doesn't start with '{{': {content_preview.decode('utf-8', 'replace')}...")
                     # Try another request with updated headers
                     time.sleep(2)
                     headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
                     response = session.get(url, headers=headers, timeout=15)
-                    if response.status_code != 200 or not response.text.strip().startswith('{'):
+                    if response.status_code != 200 or not response.content[:50].strip().startswith(b'{'):
                         logging.error("Second attempt failed to get valid JSON response")
                         return pd.DataFrame()
                     
-                data = response.json()
+                data = _json.loads(response.content)
                 if 'records' not in data or 'data' not in data['records']:
                     logging.error("Invalid JSON structure from NSE API")
                     return pd.DataFrame()
@@ -8,8 +8,8 @@ from datetime import datetime, timedelta
 import pytz
 import os
 import json
+import re
 import numpy as np
-import traceback
 import sys
 import requests
 import threading
@@ -18,6 +18,31 @@ from collections import defaultdict
 from src.fyers_api_utils import get_fyers_client
 from src.fixed_improved_websocket import enhanced_start_market_data_websocket
 from src.order_manager import OrderManager
+from src import LOGS_DIR
+
+# Option symbol patterns, compiled once since they run on every websocket tick
+# Raw NIFTY option symbol, e.g. NIFTY07AUG25C24550
+_RAW_OPTION_SYMBOL_RE = re.compile(r'NIFTY(\d{2})([A-Z]{3})(\d{2})([CP])(\d+)')
+# Fyers option symbol, e.g. NSE:NIFTY25AUG0724550CE
+_FYERS_OPTION_SYMBOL_RE = re.compile(r"NSE:NIFTY(\d{2})([A-Z]{3})(\d{2})(\d+)(CE|PE)")
+
+# Required trade_history.csv / Excel columns, in order
+TRADE_HISTORY_COLUMNS = [
+    'Entry DateTime', 'Index', 'Symbol', 'Direction', 'Entry Price',
+    'Exit DateTime', 'Exit Price', 'Stop Loss', 'Target', 'Trailing SL',
+    'Quantity', 'Brokerage', 'P&L', 'Margin Required', '% Gain/Loss',
+    'max up', 'max down', 'max up %', 'max down %'
+]
+
+def _highest_oi_row(chain, min_premium):
+    """Row with the highest open interest among strikes priced at or above min_premium, or None"""
+    # Vectorised filter + argmax instead of sorting by OI and walking the rows
+    eligible = chain[chain['lastPrice'].astype(float).to_numpy() >= min_premium]
+    if eligible.empty:
+        return None
+    # Missing OI ranks last (as it did when sorting), and an all-NaN column
+    # still yields the first eligible row instead of raising
+    return eligible.iloc[eligible['openInterest'].fillna(-1).to_numpy().argmax()]
 
 class OpenInterestStrategy:
     def __init__(self):
@@ -37,13 +62,16 @@ class OpenInterestStrategy:
         self.entry_time = None
         self.max_strike_distance = self.config.get('strategy', {}).get('max_strike_distance', 500)
         self.trade_history = []
+        # Number of leading trade_history rows already written, unchanged, to
+        # trade_history.csv (None: unknown, the next save rewrites the file)
+        self._csv_saved_rows = None
         self.order_manager = OrderManager(paper_trading=self.paper_trading)
         self._ws_lock = threading.Lock()
         
         # Load today's trade history if file exists
         today = datetime.now().strftime('%Y%m%d')
-        excel_path = f'logs/trade_history_{today}.xlsx'
-        csv_path = 'logs/trade_history.csv'
+        excel_path = os.path.join(LOGS_DIR, f'trade_history_{today}.xlsx')
+        csv_path = os.path.join(LOGS_DIR, 'trade_history.csv')
         
         if os.path.exists(excel_path):
             try:
@@ -56,6 +84,9 @@ class OpenInterestStrategy:
             try:
                 df = pd.read_csv(csv_path)
                 self.trade_history = df.to_dict('records')
+                # Rows can only be appended to a file that already has our header
+                if list(df.columns) == TRADE_HISTORY_COLUMNS:
+                    self._csv_saved_rows = len(self.trade_history)
                 logging.info(f"Loaded existing trade history from {csv_path}")
             except Exception as e:
                 logging.error(f"Error loading trade history from {csv_path}: {e}")
@@ -159,17 +190,15 @@ class OpenInterestStrategy:
                     continue
                 put_chain = option_chain[(option_chain['option_type'] == 'PE') & (option_chain['strikePrice'] >= atm_strike - max_distance) & (option_chain['strikePrice'] <= atm_strike + max_distance)]
                 if not put_chain.empty:
-                    put_oi_sorted = put_chain.sort_values('openInterest', ascending=False)
-                    for _, row in put_oi_sorted.iterrows():
+                    row = _highest_oi_row(put_chain, min_premium)
+                    if row is not None:
                         strike_premium = float(row['lastPrice'])
-                        if strike_premium >= min_premium:
-                            self.highest_put_oi_strike = int(row['strikePrice'])
-                            self.put_premium_at_9_20 = strike_premium
-                            self.highest_put_oi_symbol = row['symbol']
-                            self.put_breakout_level = round(strike_premium * 1.10, 1)
-                            self.put_expiry_idx = expiry_idx
-                            put_found = True
-                            break
+                        self.highest_put_oi_strike = int(row['strikePrice'])
+                        self.put_premium_at_9_20 = strike_premium
+                        self.highest_put_oi_symbol = row['symbol']
+                        self.put_breakout_level = round(strike_premium * 1.10, 1)
+                        self.put_expiry_idx = expiry_idx
+                        put_found = True
                 if put_found:
                     break
             # --- CALL LEG ---
@@ -182,17 +211,15 @@ class OpenInterestStrategy:
                 # FIX: use option_chain, not call_chain, in the filter below
                 call_chain = option_chain[(option_chain['option_type'] == 'CE') & (option_chain['strikePrice'] >= atm_strike - max_distance) & (option_chain['strikePrice'] <= atm_strike + max_distance)]
                 if not call_chain.empty:
-                    call_oi_sorted = call_chain.sort_values('openInterest', ascending=False)
-                    for _, row in call_oi_sorted.iterrows():
+                    row = _highest_oi_row(call_chain, min_premium)
+                    if row is not None:
                         strike_premium = float(row['lastPrice'])
-                        if strike_premium >= min_premium:
-                            self.highest_call_oi_strike = int(row['strikePrice'])
-                            self.call_premium_at_9_20 = strike_premium
-                            self.highest_call_oi_symbol = row['symbol']
-                            self.call_breakout_level = round(strike_premium * 1.10, 1)
-                            self.call_expiry_idx = expiry_idx
-                            call_found = True
-                            break
+                        self.highest_call_oi_strike = int(row['strikePrice'])
+                        self.call_premium_at_9_20 = strike_premium
+                        self.highest_call_oi_symbol = row['symbol']
+                        self.call_breakout_level = round(strike_premium * 1.10, 1)
+                        self.call_expiry_idx = expiry_idx
+                        call_found = True
                 if call_found:
                     break
             logging.info(f"Selected strikes - PUT: {self.highest_put_oi_strike} (Premium: {self.put_premium_at_9_20}, Breakout: {self.put_breakout_level}, Expiry: {self.put_expiry_idx})")
@@ -233,6 +260,8 @@ class OpenInterestStrategy:
         idx = self.active_trade.get('trade_record_idx')
         margin_required = entry_price * quantity
         if idx is not None and idx < len(self.trade_history):
+            # A row that may already be in the CSV changes, so the next save rewrites it
+            self._csv_saved_rows = None
             self.trade_history[idx].update({
                 'Exit DateTime': exit_time_actual.strftime('%Y-%m-%d %H:%M:%S'),
                 'Exit Price': exit_price,
@@ -420,23 +449,24 @@ class OpenInterestStrategy:
         import pandas as pd
         from datetime import date
         try:
-            # Define required columns in order
-            columns = [
-                'Entry DateTime', 'Index', 'Symbol', 'Direction', 'Entry Price',
-                'Exit DateTime', 'Exit Price', 'Stop Loss', 'Target', 'Trailing SL',
-                'Quantity', 'Brokerage', 'P&L', 'Margin Required', '% Gain/Loss',
-                'max up', 'max down', 'max up %', 'max down %'
-            ]
             df = pd.DataFrame(self.trade_history)
-            for col in columns:
+            for col in TRADE_HISTORY_COLUMNS:
                 if col not in df.columns:
                     df[col] = ''
-            df = df[columns]  # Ensure column order
-            # Save to CSV
-            df.to_csv('logs/trade_history.csv', index=False)
+            df = df[TRADE_HISTORY_COLUMNS]  # Ensure column order
+            # Save to CSV: append only the rows added since the last save when the
+            # earlier rows are unchanged, otherwise rewrite the whole file
+            csv_path = os.path.join(LOGS_DIR, 'trade_history.csv')
+            saved_rows = self._csv_saved_rows
+            if saved_rows is not None and saved_rows <= len(df) and os.path.exists(csv_path):
+                if saved_rows < len(df):
+                    df.iloc[saved_rows:].to_csv(csv_path, mode='a', header=False, index=False)
+            else:
+                df.to_csv(csv_path, index=False)
+            self._csv_saved_rows = len(df)
             # Save to Excel with today's date
             today = date.today().strftime('%Y%m%d')
-            excel_path = f'logs/trade_history_{today}.xlsx'
+            excel_path = os.path.join(LOGS_DIR, f'trade_history_{today}.xlsx')
             with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
                 df.to_excel(writer, index=False)
             logging.info(f"Trade history saved to CSV and Excel: {excel_path}")
@@ -473,18 +503,17 @@ class OpenInterestStrategy:
             logging.info("It's 9:20 or later. Running strategy and OI analysis...")
             return self.run_strategy(force_analysis=True)
         except Exception as e:
-            logging.error(f"Error in wait_for_market_open: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error in wait_for_market_open: %s", e)
             return {"success": False, "error": str(e)}
 
     def clear_logs(self):
         """Clear log file for a fresh start to the trading day"""
         try:
-            log_file = 'logs/strategy.log'
+            log_file = os.path.join(LOGS_DIR, 'strategy.log')
             if os.path.exists(log_file):
                 # Keep existing logs by backing up current log file
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = f'logs/strategy_{timestamp}.log.bak'
+                backup_file = os.path.join(LOGS_DIR, f'strategy_{timestamp}.log.bak')
                 
                 # Copy to backup before clearing
                 if os.path.getsize(log_file) > 0:
@@ -540,8 +569,7 @@ class OpenInterestStrategy:
             logging.info("Strategy initialization complete")
             return True
         except Exception as e:
-            logging.error(f"Error initializing strategy for the day: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error initializing strategy for the day: %s", e)
             return False
 
     def generate_daily_report(self):
@@ -604,8 +632,7 @@ class OpenInterestStrategy:
             logging.info("Strategy execution completed successfully")
             return {"success": True, "message": "Strategy executed successfully"}
         except Exception as e:
-            logging.error(f"Error in run_strategy: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error in run_strategy: %s", e)
             return {"success": False, "error": str(e)}
             
     def unsubscribe_non_triggered_symbol(self, triggered_symbol, all_symbols):
@@ -827,7 +854,6 @@ class OpenInterestStrategy:
         Ensures every unique contract (expiry, strike, type) gets a unique symbol.
         Logs original and converted symbol for diagnostics.
         """
-        import re
         import logging
         orig_symbol = symbol
         # If already in Fyers format, return as is
@@ -835,7 +861,7 @@ class OpenInterestStrategy:
             logging.info(f"[SYMBOL MAP] Already canonical: {symbol}")
             return symbol
         # Try to match NIFTY options: NIFTY07AUG25C24550 or NIFTY07AUG25P24550
-        match = re.match(r'NIFTY(\d{2})([A-Z]{3})(\d{2})([CP])(\d+)', symbol)
+        match = _RAW_OPTION_SYMBOL_RE.match(symbol)
         if match:
             year, month, day, opt_type, strike = match.groups()
             fyers_symbol = f"NSE:NIFTY{day}{month.upper()}{year}{strike}{'CE' if opt_type=='C' else 'PE'}"
@@ -867,8 +893,7 @@ class OpenInterestStrategy:
 
                 if self.active_trade:
                     traded_symbol = self.active_trade.get('symbol')
-                    import re
-                    traded_match = re.match(r"NSE:NIFTY(\d{2})([A-Z]{3})(\d{2})(\d+)(CE|PE)", traded_symbol or "")
+                    traded_match = _FYERS_OPTION_SYMBOL_RE.match(traded_symbol or "")
                     if traded_match:
                         t_day, t_month, t_year, t_strike, t_type = traded_match.groups()
                         tick_type = ticks.get('option_type')
@@ -910,8 +935,7 @@ class OpenInterestStrategy:
                         
                         logging.info(f"No active trade. Updated price for symbol: {canonical_symbol}, LTP: {ltp}")
         except Exception as e:
-            logging.error(f"Error in ws_price_update: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error in ws_price_update: %s", e)
 
     def stop_price_monitoring(self, symbol=None):
         """Stop all price monitoring and unsubscribe from all symbols after trade exit."""
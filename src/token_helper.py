@@ -3,17 +3,13 @@ import sys
 import os
 import logging
 
-# Add the project root directory to Python path for imports
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Let 'python src/token_helper.py' resolve the src package too
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
-try:
-    # Try using package import first (when running as module)
-    from src.config import load_config
-    from src.auth import generate_access_token
-except ModuleNotFoundError:
-    # Fall back to relative import (when running as script)
-    from config import load_config
-    from auth import generate_access_token
+from src.config import load_config
+from src.auth import generate_access_token
 
 def is_token_valid():
     """